@@ -0,0 +1,204 @@
+"""
+Chemical formulas and molar masses, built on get_periodic_table.
+
+Formulas may contain nested brackets, hydrates and a charge, e.g.
+
+    molar_mass("H2O")
+    molar_mass("Ca3(PO4)2")
+    molar_mass("K4[Fe(CN)6]")
+    molar_mass("CuSO4.5H2O")        # '·' and '*' also work as the hydrate dot
+    molar_mass("SO4^2-")            # or "NH4+", "Fe^3+"
+
+Each distinct formula is parsed once into a sparse element-count vector (the
+rows of the periodic table it uses and how many of each) and remembered, so
+asking again for the same formula costs a dictionary lookup. molar_masses()
+takes a whole list or pandas Series of formulas and computes all of them as
+one matrix-vector product with the column of relative atomic masses.
+The mass of the electrons gained or lost by an ion is neglected.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from .get_periodic_table import PERIODIC_TABLE
+except ImportError:
+    from get_periodic_table import PERIODIC_TABLE
+
+# indices: rows of the periodic table, counts: number of atoms of each
+CompiledFormula = namedtuple("CompiledFormula", ["indices", "counts", "charge"])
+
+_TOKEN = re.compile(r"([A-Z][a-z]?)|(\d+)|([(\[{])|([)\]}])|\s+")
+_CHARGE = re.compile(r"(?:\^(\d*)([+-])|([+-]+))$")
+_HYDRATE_DOT = re.compile(r"[.·•*]")
+_CLOSING = {"(": ")", "[": "]", "{": "}"}
+
+
+def element_counts(formula):
+    """
+    Number of atoms of each element in a formula.
+
+    Args:
+        formula: Chemical formula, e.g. "Ca3(PO4)2"
+
+    Returns:
+        Dictionary chemical symbol -> number of atoms, e.g. {"Ca": 3, "P": 2, "O": 8}
+    """
+    compiled = compile_formula(formula)
+    symbols = PERIODIC_TABLE.column("symbol")[compiled.indices]
+    return {str(s): int(n) for s, n in zip(symbols, compiled.counts)}
+
+
+def charge(formula):
+    """Charge of a formula, e.g. -2 for "SO4^2-" (0 if it has none)."""
+    return compile_formula(formula).charge
+
+
+def molar_mass(formula):
+    """
+    Molar mass of a formula in g/mol.
+
+    Args:
+        formula: Chemical formula, e.g. "CuSO4.5H2O"
+
+    Returns:
+        Molar mass as a float
+    """
+    compiled = compile_formula(formula)
+    masses = PERIODIC_TABLE.column("relative_atomic_mass")
+    return float(compiled.counts @ masses[compiled.indices])
+
+
+def molar_masses(formulas):
+    """
+    Molar masses of many formulas at once.
+
+    Every distinct formula is compiled once; the element counts of all of
+    them are put in one matrix (one row per distinct formula, one column per
+    element) which is multiplied by the column of relative atomic masses.
+
+    Args:
+        formulas: List, array or pandas Series of formula strings
+
+    Returns:
+        NumPy array of molar masses, or a pandas Series with the same index
+        if formulas is a Series
+    """
+    values = np.asarray(formulas, dtype=object)
+
+    # Number the distinct formulas in order of first appearance
+    row_of = {}
+    rows = np.fromiter((row_of.setdefault(f, len(row_of)) for f in values.ravel()), dtype=np.intp, count=values.size)
+
+    counts = np.zeros((len(row_of), len(PERIODIC_TABLE)))
+    for row, formula in enumerate(row_of):
+        compiled = compile_formula(formula)
+        counts[row, compiled.indices] = compiled.counts
+
+    masses = (counts @ PERIODIC_TABLE.column("relative_atomic_mass"))[rows].reshape(values.shape)
+
+    if hasattr(formulas, "index") and hasattr(formulas, "to_numpy"):
+        # pandas Series: keep its index and name
+        return type(formulas)(masses, index=formulas.index, name=getattr(formulas, "name", None))
+    return masses
+
+
+@lru_cache(maxsize=None)
+def compile_formula(formula):
+    """
+    Parse a formula into a sparse element-count vector (cached).
+
+    Args:
+        formula: Chemical formula string
+
+    Returns:
+        CompiledFormula(indices, counts, charge) where indices are rows of the
+        periodic table (in increasing order) and counts the number of atoms of
+        each; both are read-only arrays
+
+    Raises:
+        ValueError: If the formula cannot be parsed or contains an unknown element
+    """
+    if not isinstance(formula, str) or not formula.strip():
+        raise ValueError(f"Invalid formula: {formula!r}")
+
+    body, formula_charge = _split_charge(formula.strip(), formula)
+
+    totals = {}
+    for part in _HYDRATE_DOT.split(body):
+        # Each part of a hydrate may start with a coefficient, e.g. the 5 in CuSO4.5H2O
+        match = re.match(r"\s*(\d*)(.*)$", part, re.DOTALL)
+        coefficient = int(match.group(1)) if match.group(1) else 1
+        for index, count in _parse_group(match.group(2), formula).items():
+            totals[index] = totals.get(index, 0) + coefficient*count
+
+    indices = np.array(sorted(totals), dtype=np.intp)
+    counts = np.array([totals[i] for i in indices], dtype=np.int64)
+    indices.flags.writeable = False
+    counts.flags.writeable = False
+    return CompiledFormula(indices, counts, formula_charge)
+
+
+def _split_charge(text, formula):
+    """Split a trailing charge ('^2-', '+', '--', ...) off a formula."""
+    match = _CHARGE.search(text)
+    if not match:
+        return text, 0
+    if match.group(3):
+        sign, size = match.group(3)[0], len(match.group(3))
+        if set(match.group(3)) != {sign}:
+            raise ValueError(f"Invalid charge in formula: {formula!r}")
+    else:
+        sign, size = match.group(2), int(match.group(1) or 1)
+    return text[:match.start()], size if sign == "+" else -size
+
+
+def _parse_group(text, formula):
+    """Count the atoms in a formula without hydrate dots or charge, handling nested brackets."""
+    stack = [({}, None)]
+    position = 0
+    last = None  # what a following number multiplies: an element index or a closed group
+
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise ValueError(f"Unexpected character {text[position]!r} in formula: {formula!r}")
+        position = match.end()
+        symbol, number, opening, closing = match.groups()
+        counts = stack[-1][0]
+
+        if symbol:
+            if symbol not in PERIODIC_TABLE:
+                raise ValueError(f"Unknown element '{symbol}' in formula: {formula!r}")
+            index = PERIODIC_TABLE.index(symbol)
+            counts[index] = counts.get(index, 0) + 1
+            last = index
+        elif number:
+            if last is None:
+                raise ValueError(f"Number without an element or group before it in formula: {formula!r}")
+            multiplier = int(number)
+            if isinstance(last, dict):
+                for index, count in last.items():
+                    counts[index] += count*(multiplier - 1)
+            else:
+                counts[last] += multiplier - 1
+            last = None
+        elif opening:
+            stack.append(({}, _CLOSING[opening]))
+            last = None
+        elif closing:
+            group, expected = stack.pop() if len(stack) > 1 else (None, None)
+            if closing != expected:
+                raise ValueError(f"Unbalanced brackets in formula: {formula!r}")
+            counts = stack[-1][0]
+            for index, count in group.items():
+                counts[index] = counts.get(index, 0) + count
+            last = group
+
+    if len(stack) > 1:
+        raise ValueError(f"Unbalanced brackets in formula: {formula!r}")
+    if not stack[0][0]:
+        raise ValueError(f"No elements in formula: {formula!r}")
+    return stack[0][0]
@@ -1,121 +1,315 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+__all__ = ['get_periodic_table', 'PeriodicTable', 'PERIODIC_TABLE']
+
+_ELEMENTS = {
+    "H": {"name": "Hydrogen", "atomic_number": 1, "relative_atomic_mass": 1.0080},
+    "He": {"name": "Helium", "atomic_number": 2, "relative_atomic_mass": 4.00260},
+    "Li": {"name": "Lithium", "atomic_number": 3, "relative_atomic_mass": 7.0},
+    "Be": {"name": "Beryllium", "atomic_number": 4, "relative_atomic_mass": 9.012183},
+    "B": {"name": "Boron", "atomic_number": 5, "relative_atomic_mass": 10.81},
+    "C": {"name": "Carbon", "atomic_number": 6, "relative_atomic_mass": 12.011},
+    "N": {"name": "Nitrogen", "atomic_number": 7, "relative_atomic_mass": 14.007},
+    "O": {"name": "Oxygen", "atomic_number": 8, "relative_atomic_mass": 15.999},
+    "F": {"name": "Fluorine", "atomic_number": 9, "relative_atomic_mass": 18.998},
+    "Ne": {"name": "Neon", "atomic_number": 10, "relative_atomic_mass": 20.180},
+    "Na": {"name": "Sodium", "atomic_number": 11, "relative_atomic_mass": 22.989},
+    "Mg": {"name": "Magnesium", "atomic_number": 12, "relative_atomic_mass": 24.305},
+    "Al": {"name": "Aluminium", "atomic_number": 13, "relative_atomic_mass": 26.981},
+    "Si": {"name": "Silicon", "atomic_number": 14, "relative_atomic_mass": 28.085},
+    "P": {"name": "Phosphorus", "atomic_number": 15, "relative_atomic_mass": 30.973},
+    "S": {"name": "Sulfur", "atomic_number": 16, "relative_atomic_mass": 32.07},
+    "Cl": {"name": "Chlorine", "atomic_number": 17, "relative_atomic_mass": 35.45},
+    "Ar": {"name": "Argon", "atomic_number": 18, "relative_atomic_mass": 39.9},
+    "K": {"name": "Potassium", "atomic_number": 19, "relative_atomic_mass": 39.0983},
+    "Ca": {"name": "Calcium", "atomic_number": 20, "relative_atomic_mass": 40.08},
+    "Sc": {"name": "Scandium", "atomic_number": 21, "relative_atomic_mass": 44.95591},
+    "Ti": {"name": "Titanium", "atomic_number": 22, "relative_atomic_mass": 47.867},
+    "V": {"name": "Vanadium", "atomic_number": 23, "relative_atomic_mass": 50.9415},
+    "Cr": {"name": "Chromium", "atomic_number": 24, "relative_atomic_mass": 51.996},
+    "Mn": {"name": "Manganese", "atomic_number": 25, "relative_atomic_mass": 54.93804},
+    "Fe": {"name": "Iron", "atomic_number": 26, "relative_atomic_mass": 55.84},
+    "Co": {"name": "Cobalt", "atomic_number": 27, "relative_atomic_mass": 58.93319},
+    "Ni": {"name": "Nickel", "atomic_number": 28, "relative_atomic_mass": 58.693},
+    "Cu": {"name": "Copper", "atomic_number": 29, "relative_atomic_mass": 63.55},
+    "Zn": {"name": "Zinc", "atomic_number": 30, "relative_atomic_mass": 65.4},
+    "Ga": {"name": "Gallium", "atomic_number": 31, "relative_atomic_mass": 69.723},
+    "Ge": {"name": "Germanium", "atomic_number": 32, "relative_atomic_mass": 72.63},
+    "As": {"name": "Arsenic", "atomic_number": 33, "relative_atomic_mass": 74.92159},
+    "Se": {"name": "Selenium", "atomic_number": 34, "relative_atomic_mass": 78.97},
+    "Br": {"name": "Bromine", "atomic_number": 35, "relative_atomic_mass": 79.90},
+    "Kr": {"name": "Krypton", "atomic_number": 36, "relative_atomic_mass": 83.80},
+    "Rb": {"name": "Rubidium", "atomic_number": 37, "relative_atomic_mass": 85.468},
+    "Sr": {"name": "Strontium", "atomic_number": 38, "relative_atomic_mass": 87.62},
+    "Y": {"name": "Yttrium", "atomic_number": 39, "relative_atomic_mass": 88.90584},
+    "Zr": {"name": "Zirconium", "atomic_number": 40, "relative_atomic_mass": 91.22},
+    "Nb": {"name": "Niobium", "atomic_number": 41, "relative_atomic_mass": 92.90637},
+    "Mo": {"name": "Molybdenum", "atomic_number": 42, "relative_atomic_mass": 95.95},
+    "Tc": {"name": "Technetium", "atomic_number": 43, "relative_atomic_mass": 96.90636},
+    "Ru": {"name": "Ruthenium", "atomic_number": 44, "relative_atomic_mass": 101.1},
+    "Rh": {"name": "Rhodium", "atomic_number": 45, "relative_atomic_mass": 102.9055},
+    "Pd": {"name": "Palladium", "atomic_number": 46, "relative_atomic_mass": 106.42},
+    "Ag": {"name": "Silver", "atomic_number": 47, "relative_atomic_mass": 107.868},
+    "Cd": {"name": "Cadmium", "atomic_number": 48, "relative_atomic_mass": 112.41},
+    "In": {"name": "Indium", "atomic_number": 49, "relative_atomic_mass": 114.818},
+    "Sn": {"name": "Tin", "atomic_number": 50, "relative_atomic_mass": 118.71},
+    "Sb": {"name": "Antimony", "atomic_number": 51, "relative_atomic_mass": 121.760},
+    "Te": {"name": "Tellurium", "atomic_number": 52, "relative_atomic_mass": 127.6},
+    "I": {"name": "Iodine", "atomic_number": 53, "relative_atomic_mass": 126.9045},
+    "Xe": {"name": "Xenon", "atomic_number": 54, "relative_atomic_mass": 131.29},
+    "Cs": {"name": "Cesium", "atomic_number": 55, "relative_atomic_mass": 132.90},
+    "Ba": {"name": "Barium", "atomic_number": 56, "relative_atomic_mass": 137.33},
+    "La": {"name": "Lanthanum", "atomic_number": 57, "relative_atomic_mass": 138.9055},
+    "Ce": {"name": "Cerium", "atomic_number": 58, "relative_atomic_mass": 140.116},
+    "Pr": {"name": "Praseodymium", "atomic_number": 59, "relative_atomic_mass": 140.90},
+    "Nd": {"name": "Neodymium", "atomic_number": 60, "relative_atomic_mass": 144.24},
+    "Pm": {"name": "Promethium", "atomic_number": 61, "relative_atomic_mass": 144.91},
+    "Sm": {"name": "Samarium", "atomic_number": 62, "relative_atomic_mass": 150.4},
+    "Eu": {"name": "Europium", "atomic_number": 63, "relative_atomic_mass": 151.964},
+    "Gd": {"name": "Gadolinium", "atomic_number": 64, "relative_atomic_mass": 157.2},
+    "Tb": {"name": "Terbium", "atomic_number": 65, "relative_atomic_mass": 158.92},
+    "Dy": {"name": "Dysprosium", "atomic_number": 66, "relative_atomic_mass": 162.500},
+    "Ho": {"name": "Holmium", "atomic_number": 67, "relative_atomic_mass": 164.93},
+    "Er": {"name": "Erbium", "atomic_number": 68, "relative_atomic_mass": 167.26},
+    "Tm": {"name": "Thulium", "atomic_number": 69, "relative_atomic_mass": 168.93},
+    "Yb": {"name": "Ytterbium", "atomic_number": 70, "relative_atomic_mass": 173.05},
+    "Lu": {"name": "Lutetium", "atomic_number": 71, "relative_atomic_mass": 174.9668},
+    "Hf": {"name": "Hafnium", "atomic_number": 72, "relative_atomic_mass": 178.49},
+    "Ta": {"name": "Tantalum", "atomic_number": 73, "relative_atomic_mass": 180.9479},
+    "W": {"name": "Tungsten", "atomic_number": 74, "relative_atomic_mass": 183.84},
+    "Re": {"name": "Rhenium", "atomic_number": 75, "relative_atomic_mass": 186.207},
+    "Os": {"name": "Osmium", "atomic_number": 76, "relative_atomic_mass": 190.2},
+    "Ir": {"name": "Iridium", "atomic_number": 77, "relative_atomic_mass": 192.22},
+    "Pt": {"name": "Platinum", "atomic_number": 78, "relative_atomic_mass": 195.08},
+    "Au": {"name": "Gold", "atomic_number": 79, "relative_atomic_mass": 196.96},
+    "Hg": {"name": "Mercury", "atomic_number": 80, "relative_atomic_mass": 200.59},
+    "Tl": {"name": "Thallium", "atomic_number": 81, "relative_atomic_mass": 204.383},
+    "Pb": {"name": "Lead", "atomic_number": 82, "relative_atomic_mass": 207},
+    "Bi": {"name": "Bismuth", "atomic_number": 83, "relative_atomic_mass": 208.98},
+    "Po": {"name": "Polonium", "atomic_number": 84, "relative_atomic_mass": 208.98},
+    "At": {"name": "Astatine", "atomic_number": 85, "relative_atomic_mass": 209.98},
+    "Rn": {"name": "Radon", "atomic_number": 86, "relative_atomic_mass": 222.01},
+    "Fr": {"name": "Francium", "atomic_number": 87, "relative_atomic_mass": 223.01},
+    "Ra": {"name": "Radium", "atomic_number": 88, "relative_atomic_mass": 226.02},
+    "Ac": {"name": "Actinium", "atomic_number": 89, "relative_atomic_mass": 227.02},
+    "Th": {"name": "Thorium", "atomic_number": 90, "relative_atomic_mass": 232.038},
+    "Pa": {"name": "Protactinium", "atomic_number": 91, "relative_atomic_mass": 231.03},
+    "U": {"name": "Uranium", "atomic_number": 92, "relative_atomic_mass": 238.0289},
+    "Np": {"name": "Neptunium", "atomic_number": 93, "relative_atomic_mass": 237.04},
+    "Pu": {"name": "Plutonium", "atomic_number": 94, "relative_atomic_mass": 244.06},
+    "Am": {"name": "Americium", "atomic_number": 95, "relative_atomic_mass": 243.06},
+    "Cm": {"name": "Curium", "atomic_number": 96, "relative_atomic_mass": 247.07},
+    "Bk": {"name": "Berkelium", "atomic_number": 97, "relative_atomic_mass": 247.07},
+    "Cf": {"name": "Californium", "atomic_number": 98, "relative_atomic_mass": 251.07},
+    "Es": {"name": "Einsteinium", "atomic_number": 99, "relative_atomic_mass": 252.0830},
+    "Fm": {"name": "Fermium", "atomic_number": 100, "relative_atomic_mass": 257.0},
+    "Md": {"name": "Mendelevium", "atomic_number": 101, "relative_atomic_mass": 258.0},
+    "No": {"name": "Nobelium", "atomic_number": 102, "relative_atomic_mass": 259.1},
+    "Lr": {"name": "Lawrencium", "atomic_number": 103, "relative_atomic_mass": 266.1},
+    "Rf": {"name": "Rutherfordium", "atomic_number": 104, "relative_atomic_mass": 267.1},
+    "Db": {"name": "Dubnium", "atomic_number": 105, "relative_atomic_mass": 268.1},
+    "Sg": {"name": "Seaborgium", "atomic_number": 106, "relative_atomic_mass": 269.1},
+    "Bh": {"name": "Bohrium", "atomic_number": 107, "relative_atomic_mass": 270.1},
+    "Hs": {"name": "Hassium", "atomic_number": 108, "relative_atomic_mass": 269.1},
+    "Mt": {"name": "Meitnerium", "atomic_number": 109, "relative_atomic_mass": 277.1},
+    "Ds": {"name": "Darmstadtium", "atomic_number": 110, "relative_atomic_mass": 282.1},
+    "Rg": {"name": "Roentgenium", "atomic_number": 111, "relative_atomic_mass": 282.1},
+    "Cn": {"name": "Copernicium", "atomic_number": 112, "relative_atomic_mass": 286.1},
+    "Nh": {"name": "Nihonium", "atomic_number": 113, "relative_atomic_mass": 286.1},
+    "Fl": {"name": "Flerovium", "atomic_number": 114, "relative_atomic_mass": 290.1},
+    "Mc": {"name": "Moscovium", "atomic_number": 115, "relative_atomic_mass": 290.1},
+    "Lv": {"name": "Livermorium", "atomic_number": 116, "relative_atomic_mass": 293.2},
+    "Ts": {"name": "Tennessine", "atomic_number": 117, "relative_atomic_mass": 294.2},
+    "Og": {"name": "Oganesson", "atomic_number": 118, "relative_atomic_mass": 294.2},
+}
+
+# Stable (and long-lived natural) isotopes: (isotope mass in u, natural abundance)
+# for the elements met in the chemistry exercises. Representative isotopic
+# compositions from the NIST "Atomic Weights and Isotopic Compositions" tables.
+_ISOTOPES = {
+    "H": ((1.00782503223, 0.999885), (2.01410177812, 0.000115)),
+    "He": ((3.0160293201, 0.00000134), (4.00260325413, 0.99999866)),
+    "Li": ((6.0151228874, 0.0759), (7.0160034366, 0.9241)),
+    "Be": ((9.012183065, 1.0),),
+    "B": ((10.01293695, 0.199), (11.00930536, 0.801)),
+    "C": ((12.0, 0.9893), (13.00335483507, 0.0107)),
+    "N": ((14.00307400443, 0.99636), (15.00010889888, 0.00364)),
+    "O": ((15.99491461957, 0.99757), (16.99913175650, 0.00038), (17.99915961286, 0.00205)),
+    "F": ((18.99840316273, 1.0),),
+    "Ne": ((19.9924401762, 0.9048), (20.993846685, 0.0027), (21.991385114, 0.0925)),
+    "Na": ((22.9897692820, 1.0),),
+    "Mg": ((23.985041697, 0.7899), (24.985836976, 0.1000), (25.982592968, 0.1101)),
+    "Al": ((26.98153853, 1.0),),
+    "Si": ((27.97692653465, 0.92223), (28.97649466490, 0.04685), (29.973770136, 0.03092)),
+    "P": ((30.97376199842, 1.0),),
+    "S": ((31.9720711744, 0.9499), (32.9714589098, 0.0075), (33.967867004, 0.0425), (35.96708071, 0.0001)),
+    "Cl": ((34.968852682, 0.7576), (36.965902602, 0.2424)),
+    "Ar": ((35.967545105, 0.003336), (37.96273211, 0.000629), (39.9623831237, 0.996035)),
+    "K": ((38.9637064864, 0.932581), (39.963998166, 0.000117), (40.9618252579, 0.067302)),
+    "Ca": ((39.962590863, 0.96941), (41.95861783, 0.00647), (42.95876644, 0.00135),
+           (43.9554816, 0.02086), (45.9536890, 0.00004), (47.95252276, 0.00187)),
+    "Ti": ((45.95262772, 0.0825), (46.95175879, 0.0744), (47.94794198, 0.7372),
+           (48.94786568, 0.0541), (49.94478689, 0.0518)),
+    "V": ((49.94715601, 0.0025), (50.94395704, 0.9975)),
+    "Cr": ((49.94604183, 0.04345), (51.94050623, 0.83789), (52.94064815, 0.09501), (53.93887916, 0.02365)),
+    "Mn": ((54.93804391, 1.0),),
+    "Fe": ((53.93960899, 0.05845), (55.93493633, 0.91754), (56.93539284, 0.02119), (57.93327443, 0.00282)),
+    "Co": ((58.93319429, 1.0),),
+    "Ni": ((57.93534241, 0.68077), (59.93078588, 0.26223), (60.93105557, 0.011399),
+           (61.92834537, 0.036346), (63.92796682, 0.009255)),
+    "Cu": ((62.92959772, 0.6915), (64.92778970, 0.3085)),
+    "Zn": ((63.92914201, 0.4917), (65.92603381, 0.2773), (66.92712775, 0.0404),
+           (67.92484455, 0.1845), (69.9253192, 0.0061)),
+    "Ga": ((68.9255735, 0.60108), (70.92470258, 0.39892)),
+    "Ge": ((69.92424875, 0.2057), (71.922075826, 0.2745), (72.923458956, 0.0775),
+           (73.921177761, 0.3650), (75.921402726, 0.0773)),
+    "As": ((74.92159457, 1.0),),
+    "Se": ((73.922475934, 0.0089), (75.919213704, 0.0937), (76.919914154, 0.0763),
+           (77.91730928, 0.2377), (79.9165218, 0.4961), (81.9166995, 0.0873)),
+    "Br": ((78.9183376, 0.5069), (80.9162897, 0.4931)),
+    "Rb": ((84.9117897379, 0.7217), (86.9091805310, 0.2783)),
+    "Sr": ((83.9134191, 0.0056), (85.9092606, 0.0986), (86.9088775, 0.0700), (87.9056125, 0.8258)),
+    "Ag": ((106.9050916, 0.51839), (108.9047553, 0.48161)),
+    "I": ((126.9044719, 1.0),),
+    "Cs": ((132.905451961, 1.0),),
+    "Au": ((196.96656879, 1.0),),
+    "Pb": ((203.973044, 0.014), (205.9744657, 0.241), (206.9758973, 0.221), (207.9766525, 0.524)),
+}
+
+
+class PeriodicTable(Mapping):
+    """
+    Read-only periodic table, built once.
+
+    Behaves like a dictionary of dictionaries keyed by chemical symbol:
+    periodic_table["Fe"]["atomic_number"], .keys(), .items(),
+    "He" in periodic_table, len(...) and printing all work as for a dict.
+    Each element is returned as a fresh dictionary, so changing it does not
+    change the table.
+
+    The data is also kept as a NumPy structured array (one row per element,
+    in order of atomic number) with O(1) indexes by symbol, atomic number and
+    case-insensitive name, and whole columns are available as arrays, e.g.
+    column("relative_atomic_mass").
+    """
+
+    def __init__(self, elements, isotopes=None):
+        symbols = list(elements)
+        names = [elements[s]["name"] for s in symbols]
+        self._array = np.array(
+            [(s, elements[s]["name"], elements[s]["atomic_number"], elements[s]["relative_atomic_mass"])
+             for s in symbols],
+            dtype=[
+                ("symbol", f"U{max(map(len, symbols))}"),
+                ("name", f"U{max(map(len, names))}"),
+                ("atomic_number", np.int32),
+                ("relative_atomic_mass", np.float64),
+            ],
+        )
+        self._array.flags.writeable = False
+        self._rows = tuple(
+            {"name": name, "atomic_number": int(number), "relative_atomic_mass": float(mass)}
+            for _, name, number, mass in self._array.tolist()
+        )
+        self._by_symbol = {s: i for i, s in enumerate(symbols)}
+        self._by_atomic_number = {int(z): i for i, z in enumerate(self._array["atomic_number"])}
+        self._by_name = {name.lower(): i for i, name in enumerate(names)}
+        self._isotopes = {}
+        for symbol, table in (isotopes or {}).items():
+            masses, abundances = (np.array(column, dtype=np.float64) for column in zip(*table))
+            masses.flags.writeable = False
+            abundances.flags.writeable = False
+            self._isotopes[symbol] = (masses, abundances)
+
+    # Dictionary interface (keys are chemical symbols)
+
+    def __getitem__(self, symbol):
+        return dict(self._rows[self._by_symbol[symbol]])
+
+    def __contains__(self, symbol):
+        return symbol in self._by_symbol
+
+    def __iter__(self):
+        return iter(self._by_symbol)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def copy(self):
+        """Return the table as a plain (mutable) dictionary of dictionaries."""
+        return {s: dict(row) for s, row in zip(self._by_symbol, self._rows)}
+
+    # Indexed lookups
+
+    def index(self, symbol):
+        """Row of the element with this chemical symbol in array/column()."""
+        return self._by_symbol[symbol]
+
+    def symbol(self, atomic_number=None, name=None):
+        """Chemical symbol of the element with this atomic number or (case-insensitive) name."""
+        if atomic_number is not None:
+            return str(self._array["symbol"][self._by_atomic_number[int(atomic_number)]])
+        if name is not None:
+            return str(self._array["symbol"][self._by_name[name.lower()]])
+        raise TypeError("symbol() needs an atomic_number or a name")
+
+    def by_atomic_number(self, atomic_number):
+        """Element dictionary for an atomic number, e.g. by_atomic_number(26)."""
+        return dict(self._rows[self._by_atomic_number[int(atomic_number)]])
+
+    def by_name(self, name):
+        """Element dictionary for an element name in any case, e.g. by_name("iron")."""
+        return dict(self._rows[self._by_name[name.lower()]])
+
+    # Column access
+
+    @property
+    def array(self):
+        """The whole table as a read-only NumPy structured array."""
+        return self._array
+
+    def column(self, field):
+        """
+        One column of the table as a read-only NumPy array, in order of atomic number.
+
+        Args:
+            field: "symbol", "name", "atomic_number" or "relative_atomic_mass"
+        """
+        return self._array[field]
+
+    # Isotopes
+
+    def has_isotopes(self, symbol):
+        """Whether isotope data is available for this element."""
+        return symbol in self._isotopes
+
+    def isotopes(self, symbol):
+        """
+        Isotopes of an element.
+
+        Args:
+            symbol: Chemical symbol, e.g. "Cl"
+
+        Returns:
+            (masses, abundances): read-only arrays of isotope masses (u) and
+            natural abundances (summing to 1), in order of mass
+
+        Raises:
+            KeyError: If there is no isotope data for the element
+        """
+        if symbol not in self._isotopes:
+            raise KeyError(f"No isotope data for element '{symbol}'")
+        return self._isotopes[symbol]
+
+
+# Built once when the module is imported
+PERIODIC_TABLE = PeriodicTable(_ELEMENTS, _ISOTOPES)
+
+
 def get_periodic_table():
-    return {
-        "H": {"name": "Hydrogen", "atomic_number": 1, "relative_atomic_mass": 1.0080},
-        "He": {"name": "Helium", "atomic_number": 2, "relative_atomic_mass": 4.00260},
-        "Li": {"name": "Lithium", "atomic_number": 3, "relative_atomic_mass": 7.0},
-        "Be": {"name": "Beryllium", "atomic_number": 4, "relative_atomic_mass": 9.012183},
-        "B": {"name": "Boron", "atomic_number": 5, "relative_atomic_mass": 10.81},
-        "C": {"name": "Carbon", "atomic_number": 6, "relative_atomic_mass": 12.011},
-        "N": {"name": "Nitrogen", "atomic_number": 7, "relative_atomic_mass": 14.007},
-        "O": {"name": "Oxygen", "atomic_number": 8, "relative_atomic_mass": 15.999},
-        "F": {"name": "Fluorine", "atomic_number": 9, "relative_atomic_mass": 18.998},
-        "Ne": {"name": "Neon", "atomic_number": 10, "relative_atomic_mass": 20.180},
-        "Na": {"name": "Sodium", "atomic_number": 11, "relative_atomic_mass": 22.989},
-        "Mg": {"name": "Magnesium", "atomic_number": 12, "relative_atomic_mass": 24.305},
-        "Al": {"name": "Aluminium", "atomic_number": 13, "relative_atomic_mass": 26.981},
-        "Si": {"name": "Silicon", "atomic_number": 14, "relative_atomic_mass": 28.085},
-        "P": {"name": "Phosphorus", "atomic_number": 15, "relative_atomic_mass": 30.973},
-        "S": {"name": "Sulfur", "atomic_number": 16, "relative_atomic_mass": 32.07},
-        "Cl": {"name": "Chlorine", "atomic_number": 17, "relative_atomic_mass": 35.45},
-        "Ar": {"name": "Argon", "atomic_number": 18, "relative_atomic_mass": 39.9},
-        "K": {"name": "Potassium", "atomic_number": 19, "relative_atomic_mass": 39.0983},
-        "Ca": {"name": "Calcium", "atomic_number": 20, "relative_atomic_mass": 40.08},
-        "Sc": {"name": "Scandium", "atomic_number": 21, "relative_atomic_mass": 44.95591},
-        "Ti": {"name": "Titanium", "atomic_number": 22, "relative_atomic_mass": 47.867},
-        "V": {"name": "Vanadium", "atomic_number": 23, "relative_atomic_mass": 50.9415},
-        "Cr": {"name": "Chromium", "atomic_number": 24, "relative_atomic_mass": 51.996},
-        "Mn": {"name": "Manganese", "atomic_number": 25, "relative_atomic_mass": 54.93804},
-        "Fe": {"name": "Iron", "atomic_number": 26, "relative_atomic_mass": 55.84},
-        "Co": {"name": "Cobalt", "atomic_number": 27, "relative_atomic_mass": 58.93319},
-        "Ni": {"name": "Nickel", "atomic_number": 28, "relative_atomic_mass": 58.693},
-        "Cu": {"name": "Copper", "atomic_number": 29, "relative_atomic_mass": 63.55},
-        "Zn": {"name": "Zinc", "atomic_number": 30, "relative_atomic_mass": 65.4},
-        "Ga": {"name": "Gallium", "atomic_number": 31, "relative_atomic_mass": 69.723},
-        "Ge": {"name": "Germanium", "atomic_number": 32, "relative_atomic_mass": 72.63},
-        "As": {"name": "Arsenic", "atomic_number": 33, "relative_atomic_mass": 74.92159},
-        "Se": {"name": "Selenium", "atomic_number": 34, "relative_atomic_mass": 78.97},
-        "Br": {"name": "Bromine", "atomic_number": 35, "relative_atomic_mass": 79.90},
-        "Kr": {"name": "Krypton", "atomic_number": 36, "relative_atomic_mass": 83.80},
-        "Rb": {"name": "Rubidium", "atomic_number": 37, "relative_atomic_mass": 85.468},
-        "Sr": {"name": "Strontium", "atomic_number": 38, "relative_atomic_mass": 87.62},
-        "Y": {"name": "Yttrium", "atomic_number": 39, "relative_atomic_mass": 88.90584},
-        "Zr": {"name": "Zirconium", "atomic_number": 40, "relative_atomic_mass": 91.22},
-        "Nb": {"name": "Niobium", "atomic_number": 41, "relative_atomic_mass": 92.90637},
-        "Mo": {"name": "Molybdenum", "atomic_number": 42, "relative_atomic_mass": 95.95},
-        "Tc": {"name": "Technetium", "atomic_number": 43, "relative_atomic_mass": 96.90636},
-        "Ru": {"name": "Ruthenium", "atomic_number": 44, "relative_atomic_mass": 101.1},
-        "Rh": {"name": "Rhodium", "atomic_number": 45, "relative_atomic_mass": 102.9055},
-        "Pd": {"name": "Palladium", "atomic_number": 46, "relative_atomic_mass": 106.42},
-        "Ag": {"name": "Silver", "atomic_number": 47, "relative_atomic_mass": 107.868},
-        "Cd": {"name": "Cadmium", "atomic_number": 48, "relative_atomic_mass": 112.41},
-        "In": {"name": "Indium", "atomic_number": 49, "relative_atomic_mass": 114.818},
-        "Sn": {"name": "Tin", "atomic_number": 50, "relative_atomic_mass": 118.71},
-        "Sb": {"name": "Antimony", "atomic_number": 51, "relative_atomic_mass": 121.760},
-        "Te": {"name": "Tellurium", "atomic_number": 52, "relative_atomic_mass": 127.6},
-        "I": {"name": "Iodine", "atomic_number": 53, "relative_atomic_mass": 126.9045},
-        "Xe": {"name": "Xenon", "atomic_number": 54, "relative_atomic_mass": 131.29},
-        "Cs": {"name": "Cesium", "atomic_number": 55, "relative_atomic_mass": 132.90},
-        "Ba": {"name": "Barium", "atomic_number": 56, "relative_atomic_mass": 137.33},
-        "La": {"name": "Lanthanum", "atomic_number": 57, "relative_atomic_mass": 138.9055},
-        "Ce": {"name": "Cerium", "atomic_number": 58, "relative_atomic_mass": 140.116},
-        "Pr": {"name": "Praseodymium", "atomic_number": 59, "relative_atomic_mass": 140.90},
-        "Nd": {"name": "Neodymium", "atomic_number": 60, "relative_atomic_mass": 144.24},
-        "Pm": {"name": "Promethium", "atomic_number": 61, "relative_atomic_mass": 144.91},
-        "Sm": {"name": "Samarium", "atomic_number": 62, "relative_atomic_mass": 150.4},
-        "Eu": {"name": "Europium", "atomic_number": 63, "relative_atomic_mass": 151.964},
-        "Gd": {"name": "Gadolinium", "atomic_number": 64, "relative_atomic_mass": 157.2},
-        "Tb": {"name": "Terbium", "atomic_number": 65, "relative_atomic_mass": 158.92},
-        "Dy": {"name": "Dysprosium", "atomic_number": 66, "relative_atomic_mass": 162.500},
-        "Ho": {"name": "Holmium", "atomic_number": 67, "relative_atomic_mass": 164.93},
-        "Er": {"name": "Erbium", "atomic_number": 68, "relative_atomic_mass": 167.26},
-        "Tm": {"name": "Thulium", "atomic_number": 69, "relative_atomic_mass": 168.93},
-        "Yb": {"name": "Ytterbium", "atomic_number": 70, "relative_atomic_mass": 173.05},
-        "Lu": {"name": "Lutetium", "atomic_number": 71, "relative_atomic_mass": 174.9668},
-        "Hf": {"name": "Hafnium", "atomic_number": 72, "relative_atomic_mass": 178.49},
-        "Ta": {"name": "Tantalum", "atomic_number": 73, "relative_atomic_mass": 180.9479},
-        "W": {"name": "Tungsten", "atomic_number": 74, "relative_atomic_mass": 183.84},
-        "Re": {"name": "Rhenium", "atomic_number": 75, "relative_atomic_mass": 186.207},
-        "Os": {"name": "Osmium", "atomic_number": 76, "relative_atomic_mass": 190.2},
-        "Ir": {"name": "Iridium", "atomic_number": 77, "relative_atomic_mass": 192.22},
-        "Pt": {"name": "Platinum", "atomic_number": 78, "relative_atomic_mass": 195.08},
-        "Au": {"name": "Gold", "atomic_number": 79, "relative_atomic_mass": 196.96},
-        "Hg": {"name": "Mercury", "atomic_number": 80, "relative_atomic_mass": 200.59},
-        "Tl": {"name": "Thallium", "atomic_number": 81, "relative_atomic_mass": 204.383},
-        "Pb": {"name": "Lead", "atomic_number": 82, "relative_atomic_mass": 207},
-        "Bi": {"name": "Bismuth", "atomic_number": 83, "relative_atomic_mass": 208.98},
-        "Po": {"name": "Polonium", "atomic_number": 84, "relative_atomic_mass": 208.98},
-        "At": {"name": "Astatine", "atomic_number": 85, "relative_atomic_mass": 209.98},
-        "Rn": {"name": "Radon", "atomic_number": 86, "relative_atomic_mass": 222.01},
-        "Fr": {"name": "Francium", "atomic_number": 87, "relative_atomic_mass": 223.01},
-        "Ra": {"name": "Radium", "atomic_number": 88, "relative_atomic_mass": 226.02},
-        "Ac": {"name": "Actinium", "atomic_number": 89, "relative_atomic_mass": 227.02},
-        "Th": {"name": "Thorium", "atomic_number": 90, "relative_atomic_mass": 232.038},
-        "Pa": {"name": "Protactinium", "atomic_number": 91, "relative_atomic_mass": 231.03},
-        "U": {"name": "Uranium", "atomic_number": 92, "relative_atomic_mass": 238.0289},
-        "Np": {"name": "Neptunium", "atomic_number": 93, "relative_atomic_mass": 237.04},
-        "Pu": {"name": "Plutonium", "atomic_number": 94, "relative_atomic_mass": 244.06},
-        "Am": {"name": "Americium", "atomic_number": 95, "relative_atomic_mass": 243.06},
-        "Cm": {"name": "Curium", "atomic_number": 96, "relative_atomic_mass": 247.07},
-        "Bk": {"name": "Berkelium", "atomic_number": 97, "relative_atomic_mass": 247.07},
-        "Cf": {"name": "Californium", "atomic_number": 98, "relative_atomic_mass": 251.07},
-        "Es": {"name": "Einsteinium", "atomic_number": 99, "relative_atomic_mass": 252.0830},
-        "Fm": {"name": "Fermium", "atomic_number": 100, "relative_atomic_mass": 257.0},
-        "Md": {"name": "Mendelevium", "atomic_number": 101, "relative_atomic_mass": 258.0},
-        "No": {"name": "Nobelium", "atomic_number": 102, "relative_atomic_mass": 259.1},
-        "Lr": {"name": "Lawrencium", "atomic_number": 103, "relative_atomic_mass": 266.1},
-        "Rf": {"name": "Rutherfordium", "atomic_number": 104, "relative_atomic_mass": 267.1},
-        "Db": {"name": "Dubnium", "atomic_number": 105, "relative_atomic_mass": 268.1},
-        "Sg": {"name": "Seaborgium", "atomic_number": 106, "relative_atomic_mass": 269.1},
-        "Bh": {"name": "Bohrium", "atomic_number": 107, "relative_atomic_mass": 270.1},
-        "Hs": {"name": "Hassium", "atomic_number": 108, "relative_atomic_mass": 269.1},
-        "Mt": {"name": "Meitnerium", "atomic_number": 109, "relative_atomic_mass": 277.1},
-        "Ds": {"name": "Darmstadtium", "atomic_number": 110, "relative_atomic_mass": 282.1},
-        "Rg": {"name": "Roentgenium", "atomic_number": 111, "relative_atomic_mass": 282.1},
-        "Cn": {"name": "Copernicium", "atomic_number": 112, "relative_atomic_mass": 286.1},
-        "Nh": {"name": "Nihonium", "atomic_number": 113, "relative_atomic_mass": 286.1},
-        "Fl": {"name": "Flerovium", "atomic_number": 114, "relative_atomic_mass": 290.1},
-        "Mc": {"name": "Moscovium", "atomic_number": 115, "relative_atomic_mass": 290.1},
-        "Lv": {"name": "Livermorium", "atomic_number": 116, "relative_atomic_mass": 293.2},
-        "Ts": {"name": "Tennessine", "atomic_number": 117, "relative_atomic_mass": 294.2},
-        "Og": {"name": "Oganesson", "atomic_number": 118, "relative_atomic_mass": 294.2},
-    }
+    return PERIODIC_TABLE
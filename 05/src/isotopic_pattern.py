@@ -0,0 +1,124 @@
+"""
+Isotopic patterns (mass spectrum peaks) of chemical formulas.
+
+    masses, abundances = isotopic_pattern("C100H202")
+
+The pattern is computed at unit-mass resolution: all isotopic combinations
+with the same nominal mass (number of nucleons) are one peak, placed at their
+abundance-weighted average exact mass. Instead of enumerating combinations of
+isotopes, each element's isotope distribution is put on a grid of nominal
+mass offsets and the distribution of the molecule is obtained by
+convolution, done in Fourier space where convolving n copies of an element
+is raising its transform to the n-th power. The abundance-weighted masses are
+carried along by the same products (the derivative of the generating
+function), so no peak is ever enumerated.
+
+For large molecules only a window of mean +/- several standard deviations of
+the nominal mass is kept: the (cyclic) FFT is then only as long as that
+window, and everything outside it, far below any measurable abundance, is
+pruned together with the peaks below min_abundance.
+"""
+import numpy as np
+
+try:
+    from .chemical_formula import compile_formula
+    from .get_periodic_table import PERIODIC_TABLE
+except ImportError:
+    from chemical_formula import compile_formula
+    from get_periodic_table import PERIODIC_TABLE
+
+# Half width of the window kept for large molecules, in standard deviations
+# of the nominal mass (plus the spread of the heaviest element's isotopes)
+WINDOW_SIGMAS = 12
+
+
+def isotopic_pattern(formula, min_abundance=1e-6, relative=False):
+    """
+    Isotopic pattern of a formula.
+
+    Args:
+        formula: Chemical formula, e.g. "C6H12O6" or "CH2Cl2"
+        min_abundance: Peaks with a smaller abundance (as a fraction of the
+            total, or of the largest peak if relative=True) are dropped
+        relative: Scale the abundances so that the largest peak is 1
+
+    Returns:
+        (masses, abundances): arrays of peak masses in u (in increasing
+        order) and their abundances (fractions of all molecules, unless
+        relative=True)
+
+    Raises:
+        KeyError: If there is no isotope data for an element of the formula
+    """
+    compiled = compile_formula(formula)
+    symbols = PERIODIC_TABLE.column("symbol")[compiled.indices]
+
+    # Each element on its own grid of nominal mass offsets from its lightest isotope
+    elements = []
+    mean = variance = 0.0
+    span = 0
+    for symbol, count in zip(symbols, compiled.counts):
+        if count == 0:
+            continue
+        masses, abundances = PERIODIC_TABLE.isotopes(str(symbol))
+        nominal = np.rint(masses).astype(int)
+        offsets = nominal - nominal[0]
+        elements.append((offsets, abundances, masses, int(count)))
+        element_mean = offsets @ abundances
+        mean += count*element_mean
+        variance += count*(((offsets - element_mean)**2) @ abundances)
+        span = max(span, offsets[-1])
+
+    total_span = sum(count*offsets[-1] for offsets, _, _, count in elements)
+    start, size = 0, total_span + 1
+    half_width = int(np.ceil(WINDOW_SIGMAS*np.sqrt(variance))) + span
+    if 2*half_width + 1 < size:
+        start = max(int(np.floor(mean)) - half_width, 0)
+        size = 2*half_width + 1
+
+    probability, weighted_mass = _convolve(elements, size)
+
+    # Offsets start, start + 1, ... are at index (offset mod n_fft) of the cyclic result
+    n_fft = len(probability)
+    index = (start + np.arange(size)) % n_fft
+    probability, weighted_mass = probability[index], weighted_mass[index]
+
+    threshold = min_abundance*(probability.max() if relative else 1.0)
+    keep = probability > max(threshold, 1e-300)
+    abundances = probability[keep]
+    masses = weighted_mass[keep]/abundances
+    if relative:
+        abundances = abundances/abundances.max()
+    return masses, abundances
+
+
+def _convolve(elements, size):
+    """
+    Distribution of the nominal mass offset of the molecule, and the same
+    distribution weighted by exact mass, by FFT convolution of the elements.
+    """
+    n_fft = 1 << max(int(size - 1).bit_length(), 1)
+
+    transforms, mass_transforms, counts = [], [], []
+    for offsets, abundances, masses, count in elements:
+        grid = np.zeros(n_fft)
+        mass_grid = np.zeros(n_fft)
+        np.add.at(grid, offsets % n_fft, abundances)
+        np.add.at(mass_grid, offsets % n_fft, abundances*masses)
+        transforms.append(np.fft.rfft(grid))
+        mass_transforms.append(np.fft.rfft(mass_grid))
+        counts.append(count)
+
+    powers = [t**n for t, n in zip(transforms, counts)]
+    total = np.prod(powers, axis=0)
+
+    # d/dx of prod_e P_e(x)^n_e with each isotope's mass as the weight:
+    # sum over elements of n_e * M_e * P_e^(n_e - 1) * (all the other elements)
+    weighted = np.zeros_like(total)
+    for e, (t, m, n) in enumerate(zip(transforms, mass_transforms, counts)):
+        others = np.prod([p for f, p in enumerate(powers) if f != e], axis=0) if len(powers) > 1 else 1
+        weighted += n*m*t**(n - 1)*others
+
+    probability = np.clip(np.fft.irfft(total, n_fft), 0, None)
+    weighted_mass = np.clip(np.fft.irfft(weighted, n_fft), 0, None)
+    return probability, weighted_mass
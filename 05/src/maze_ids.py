@@ -0,0 +1,197 @@
+"""
+Maze IDs and wall generation for RobotMaze.
+
+Two maze ID formats are understood:
+
+- legacy 'size-wallprob-seed' (e.g. '10-30-12345'), decoded with a
+  np.random.RandomState exactly as earlier versions of RobotMaze did, so
+  IDs already handed out to students still give the same maze;
+- versioned 'v2-size-wallprob-seed-index' (e.g. 'v2-10-30-9f3a...-0'),
+  where seed is a 64-bit hexadecimal number and index selects one maze
+  from a batch. These are drawn with np.random.Generator / PCG64.
+
+A v2 maze's first attempt is block `index` of the PCG64 stream seeded with
+`seed`, so generate_batch() can draw the first attempt of every maze in a
+batch with a single vectorized call and each maze can still be rebuilt on
+its own by jumping ahead in that stream. Mazes that turn out unsolvable are
+redrawn from their own independent child stream (spawn key = index).
+"""
+import secrets
+from collections import namedtuple
+from itertools import chain, islice
+
+import numpy as np
+
+# version: 1 (legacy) or 2, wall_percent: wall probability in percent
+MazeSpec = namedtuple("MazeSpec", ["version", "size", "wall_percent", "seed", "index"])
+
+
+def new_maze_spec(size, wall_probability):
+    """
+    Create the spec of a brand new v2 maze with a fresh random seed.
+
+    Args:
+        size: Size of the square maze
+        wall_probability: Probability of a square being a wall (0.0 to 1.0)
+
+    Returns:
+        MazeSpec for the new maze
+    """
+    return MazeSpec(2, int(size), int(round(wall_probability * 100)), secrets.randbits(64), 0)
+
+
+def parse_maze_id(maze_id):
+    """
+    Parse a legacy or v2 maze ID string.
+
+    Args:
+        maze_id: String ID, e.g. '10-30-12345' or 'v2-10-30-9f3a0c1d2b4e5f60-0'
+
+    Returns:
+        MazeSpec describing the maze
+
+    Raises:
+        ValueError: If the ID is not in either format
+    """
+    try:
+        parts = str(maze_id).split('-')
+        if parts[0] == 'v2':
+            if len(parts) != 5:
+                raise ValueError
+            spec = MazeSpec(2, int(parts[1]), int(parts[2]), int(parts[3], 16), int(parts[4]))
+        else:
+            spec = MazeSpec(1, int(parts[0]), int(parts[1]), int(parts[2]), 0)
+    except (IndexError, ValueError):
+        raise ValueError(
+            f"Invalid maze_id format: '{maze_id}'. "
+            f"Expected format: 'v2-size-wallprob-seed-index' (e.g., 'v2-10-30-9f3a0c1d2b4e5f60-0') "
+            f"or legacy 'size-wallprob-seed' (e.g., '10-30-12345')"
+        )
+    if spec.size < 1 or spec.index < 0:
+        raise ValueError(f"Invalid maze_id: '{maze_id}'. Size must be positive and index non-negative.")
+    return spec
+
+
+def format_maze_id(spec):
+    """Turn a MazeSpec back into its maze ID string."""
+    if spec.version == 1:
+        return f"{spec.size}-{spec.wall_percent}-{spec.seed}"
+    return f"v2-{spec.size}-{spec.wall_percent}-{spec.seed:016x}-{spec.index}"
+
+
+def generate_walls(spec, max_attempts=1000):
+    """
+    Generate the walls of a solvable maze from its spec.
+
+    Args:
+        spec: MazeSpec, as returned by parse_maze_id() or new_maze_spec()
+        max_attempts: Maximum attempts to generate a solvable maze
+
+    Returns:
+        Boolean array of shape (size, size), True where there is a wall
+
+    Raises:
+        RuntimeError: If no solvable maze was found within max_attempts
+    """
+    if spec.version == 1:
+        candidates = _legacy_attempts(spec)
+    else:
+        candidates = chain([_first_attempt(spec)], _child_attempts(spec))
+    return _first_solvable(spec, candidates, max_attempts)
+
+
+def generate_batch(n, size=10, p=0.2, seed=None, max_attempts=1000):
+    """
+    Generate n reproducible, solvable mazes at once.
+
+    The first attempt of all n mazes comes from one vectorized draw; only
+    the mazes that are not solvable are redrawn one at a time.
+
+    Args:
+        n: Number of mazes
+        size: Size of each square maze (default 10)
+        p: Probability of a square being a wall (default 0.2)
+        seed: Integer batch seed (default None = random)
+        max_attempts: Maximum attempts per maze to make it solvable
+
+    Returns:
+        (maze_ids, walls) where maze_ids is a list of n maze ID strings that
+        can be passed to RobotMaze(maze_id=...) and walls is a boolean array
+        of shape (n, size, size), True where there is a wall
+    """
+    seed = secrets.randbits(64) if seed is None else int(seed) % 2**64
+    wall_percent = int(round(p * 100))
+    specs = [MazeSpec(2, int(size), wall_percent, seed, k) for k in range(n)]
+
+    # Same threshold as _first_attempt(), which only knows the percentage in the ID
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed)))
+    walls = rng.random((n, size, size)) < wall_percent / 100.0
+    walls[:, 0, 0] = False
+    walls[:, -1, -1] = False
+
+    for k in np.flatnonzero(~_reachable(~walls)):
+        walls[k] = _first_solvable(specs[k], chain([walls[k]], _child_attempts(specs[k])), max_attempts)
+
+    return [format_maze_id(spec) for spec in specs], walls
+
+
+def _legacy_attempts(spec):
+    """Candidate wall grids for a legacy maze ID (same stream as the original per-square loop)."""
+    rng = np.random.RandomState(spec.seed)
+    while True:
+        yield rng.random_sample((spec.size, spec.size)) < spec.wall_percent / 100.0
+
+
+def _first_attempt(spec):
+    """First candidate of a v2 maze: block `index` of the batch stream."""
+    bit_generator = np.random.PCG64(np.random.SeedSequence(spec.seed))
+    # Generator.random() consumes exactly one 64-bit output per float
+    bit_generator.advance(spec.index * spec.size * spec.size)
+    return np.random.Generator(bit_generator).random((spec.size, spec.size)) < spec.wall_percent / 100.0
+
+
+def _child_attempts(spec):
+    """Further candidates of a v2 maze, from its own independent child stream."""
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(spec.seed, spawn_key=(spec.index,))))
+    while True:
+        yield rng.random((spec.size, spec.size)) < spec.wall_percent / 100.0
+
+
+def _first_solvable(spec, candidates, max_attempts):
+    """Return the first candidate wall grid with a path from start to target."""
+    for walls in islice(candidates, max(max_attempts, 0)):
+        # Ensure start and target are not walls
+        walls[0, 0] = False
+        walls[-1, -1] = False
+        if _reachable(~walls[np.newaxis])[0]:
+            return walls
+    raise RuntimeError(
+        f"Failed to generate a solvable maze after {max_attempts} attempts. "
+        f"Try reducing wall_probability (currently {spec.wall_percent / 100.0}) or "
+        f"increasing maze_size (currently {spec.size})."
+    )
+
+
+def _reachable(open_squares):
+    """
+    Check for several mazes at once whether the target (bottom-right) can be
+    reached from the start (top-left), by flood filling all of them together.
+
+    Args:
+        open_squares: Boolean array of shape (n, size, size), True where the robot can go
+
+    Returns:
+        Boolean array of shape (n,)
+    """
+    reached = np.zeros_like(open_squares)
+    reached[:, 0, 0] = open_squares[:, 0, 0]
+    while True:
+        grown = reached.copy()
+        grown[:, 1:, :] |= reached[:, :-1, :]
+        grown[:, :-1, :] |= reached[:, 1:, :]
+        grown[:, :, 1:] |= reached[:, :, :-1]
+        grown[:, :, :-1] |= reached[:, :, 1:]
+        grown &= open_squares
+        if np.array_equal(grown, reached):
+            return reached[:, -1, -1]
+        reached = grown
@@ -0,0 +1,101 @@
+import numpy as np
+
+try:
+    from .photogate_data import pack_trials
+except ImportError:
+    from photogate_data import pack_trials
+
+# ASCII codes of the photogate symbols
+X, O, E = ord('x'), ord('o'), ord('e')
+
+# Ways of replacing the 'e' (error) samples:
+#   'previous' - repeat the last good sample of the trial
+#   'next'     - use the next good sample of the trial
+#   'o' / 'x'  - treat every error as unblocked / blocked
+IMPUTE_METHODS = ('previous', 'next', 'o', 'x')
+
+
+# Blocked (True) / unblocked (False) for every sample of every trial, with
+# the 'e' samples replaced according to impute. An error at the very start
+# (for 'previous') or very end (for 'next') of a trial has no good sample to
+# copy, so it counts as unblocked
+def impute_errors(symbols, offsets, impute='previous'):
+    if impute not in IMPUTE_METHODS:
+        raise ValueError(f"impute must be one of {IMPUTE_METHODS}, not '{impute}'")
+
+    symbols = np.asarray(symbols)
+    blocked = symbols == X
+    if impute in ('o', 'x'):
+        blocked[symbols == E] = impute == 'x'
+        return blocked
+
+    good = symbols != E
+    n = len(symbols)
+    starts, ends = offsets[:-1], offsets[1:]
+    not_empty = ends > starts
+    # The first (or last) sample of each trial always counts as good, so that
+    # filling never copies a sample across two trials
+    edge = starts[not_empty] if impute == 'previous' else ends[not_empty] - 1
+    blocked[edge] &= good[edge]
+    good[edge] = True
+
+    index = np.arange(n)
+    if impute == 'previous':
+        source = np.maximum.accumulate(np.where(good, index, 0))
+    else:
+        source = np.minimum.accumulate(np.where(good, index, n)[::-1])[::-1]
+    return blocked[source]
+
+
+# Leading edges (o -> x transitions) of all trials.
+# Returns (trial, sample) arrays: the trial number and the sample index within
+# that trial at which each bar starts blocking the beam
+def leading_edges(symbols, offsets, impute='previous'):
+    blocked = impute_errors(symbols, offsets, impute)
+    rising = np.flatnonzero(blocked[1:] & ~blocked[:-1]) + 1
+    trial = np.searchsorted(offsets, rising, side='right') - 1
+    sample = rising - offsets[trial]
+    # A trial starting blocked is not a leading edge (nor is the jump between two trials)
+    keep = sample > 0
+    return trial[keep], sample[keep]
+
+
+# Velocity of the fence between consecutive leading edges. Leading edges are
+# delta_d apart, so the average velocity between two of them is delta_d
+# divided by the time between them, which (for constant acceleration) is the
+# velocity at the middle of that time interval.
+# Returns (trial, mid_times, velocities) arrays, one entry per pair of edges
+def bar_velocities(symbols, offsets, delta_t, delta_d, impute='previous'):
+    trial, sample = leading_edges(symbols, offsets, impute)
+    times = sample*delta_t
+    same_trial = trial[1:] == trial[:-1]
+    mid_times = ((times[1:] + times[:-1])/2)[same_trial]
+    velocities = (delta_d/(times[1:] - times[:-1]))[same_trial]
+    return trial[1:][same_trial], mid_times, velocities
+
+
+# Estimate g for every trial as the slope of a straight-line fit of velocity
+# against time. All trials are fitted at once from per-trial sums.
+# Returns an array with one g per trial (nan if a trial has fewer than 3 bars)
+def estimate_g(symbols, offsets, delta_t, delta_d, impute='previous'):
+    trial, t, v = bar_velocities(symbols, offsets, delta_t, delta_d, impute)
+    num_trials = len(offsets) - 1
+
+    def per_trial(values):
+        return np.bincount(trial, weights=values, minlength=num_trials)
+
+    n = per_trial(np.ones_like(t))
+    sum_t, sum_v = per_trial(t), per_trial(v)
+    sum_tt, sum_tv = per_trial(t*t), per_trial(t*v)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        g = (n*sum_tv - sum_t*sum_v)/(n*sum_tt - sum_t**2)
+    g[n < 2] = np.nan
+    return g
+
+
+# Same as estimate_g, for a dictionary of x/o/e strings as returned by
+# read_photogate_data or gen_data_dict. Returns a dictionary trial name -> g
+def estimate_g_dict(data_dict, delta_t, delta_d, impute='previous'):
+    names, symbols, offsets = pack_trials(data_dict)
+    return dict(zip(names.tolist(), estimate_g(symbols, offsets, delta_t, delta_d, impute).tolist()))
@@ -1,86 +1,170 @@
-import random
+import os
 import pickle
-
-# This function reads the photogate data
-def read_photogate_data(filename='/home/jovyan/SCIF10002-2025.git/05/src/photogate_data.pkl'):
+import zipfile
+
+import numpy as np
+
+# Folder of this file, where the photogate data files live
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# This function reads the photogate data as a dictionary of strings
+# (from the .npz file if there is one, otherwise from the original pickle)
+def read_photogate_data(filename=None):
+    if filename is None:
+        filename = os.path.join(DATA_DIR, 'photogate_data.npz')
+        if not os.path.exists(filename):
+            filename = os.path.join(DATA_DIR, 'photogate_data.pkl')
+    if filename.endswith('.npz'):
+        names, symbols, offsets = load_photogate_arrays(filename)
+        return {name: symbols[offsets[i]:offsets[i+1]].tobytes().decode('ascii') for i, name in enumerate(names)}
     with open(filename, 'rb') as f:
         return pickle.load(f)
 
+
+# Load the photogate data from an .npz file written by save_photogate_arrays.
+# All trials are stored back to back in one uint8 array of ASCII codes
+# (ord('x'), ord('o'), ord('e')); trial i is symbols[offsets[i]:offsets[i+1]].
+# With mmap=True the symbols are memory-mapped straight from the file
+# instead of being read into memory.
+def load_photogate_arrays(filename=None, mmap=True):
+    if filename is None:
+        filename = os.path.join(DATA_DIR, 'photogate_data.npz')
+    with np.load(filename) as data:
+        names = data['names']
+        offsets = data['offsets']
+        symbols = _memmap_npz_member(filename, 'symbols.npy') if mmap else None
+        if symbols is None:
+            symbols = data['symbols']
+    return names, symbols, offsets
+
+
+# Dictionary of trial name -> uint8 array for each trial. The arrays are
+# views into symbols, so no data is copied
+def trial_views(names, symbols, offsets):
+    return {name: symbols[offsets[i]:offsets[i+1]] for i, name in enumerate(names)}
+
+
+# Turn a dictionary of x/o/e strings into (names, symbols, offsets) arrays,
+# with all trials back to back in symbols as in load_photogate_arrays
+def pack_trials(data_dict):
+    names = np.array(list(data_dict.keys()))
+    joined = ''.join(data_dict.values()).encode('ascii')
+    symbols = np.frombuffer(joined, dtype=np.uint8)
+    lengths = [len(trial) for trial in data_dict.values()]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    return names, symbols, offsets
+
+
+# Save a dictionary of x/o/e strings in the .npz format read by load_photogate_arrays
+def save_photogate_arrays(data_dict, filename):
+    names, symbols, offsets = pack_trials(data_dict)
+    # Uncompressed, so that the symbols can be memory-mapped
+    np.savez(filename, names=names, symbols=symbols, offsets=offsets)
+
+
+# Convert the original pickle file to the .npz format
+def convert_pickle_to_npz(pkl_filename, npz_filename=None):
+    if npz_filename is None:
+        npz_filename = os.path.splitext(pkl_filename)[0] + '.npz'
+    save_photogate_arrays(read_photogate_data(pkl_filename), npz_filename)
+    return npz_filename
+
+
+# Memory-map one array stored (uncompressed) inside an .npz file.
+# Returns None if that is not possible, e.g. if the file is compressed
+def _memmap_npz_member(filename, member):
+    with zipfile.ZipFile(filename) as zf:
+        info = zf.getinfo(member)
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+    with open(filename, 'rb') as f:
+        # Skip the zip local file header (30 bytes + file name + extra field)
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = np.frombuffer(f.read(4), dtype='<u2')
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        # Then the .npy header
+        version = np.lib.format.read_magic(f)
+        if version != (1, 0):
+            return None
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        offset = f.tell()
+    if fortran_order or dtype.hasobject:
+        return None
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+
 # The below function was used to simulate the data for the physics photogate challenge
-def gen_data_dict(delta_t, delta_d, error_prev=0.25):
+def gen_data_dict(delta_t, delta_d, error_prev=0.25, seed=None, num_trials=100):
+    
+    # Random number generator (pass a seed to get the same data every time)
+    rng = np.random.default_rng(seed)
     
     # Empty data_dict
     data_dict = {}
     
     # Loop through trials
-    for i in range(100):
+    for i in range(num_trials):
         
         # Trial string
         trial_str = 'Trial ' + str(i)
 
-        ## Data generation for one trial
-
         # Decide number of bars in picket fence
-        num_bars = random.randint(4, 10)
-
-        # Height dropped from (H)
-        H = 1.5
-
-        # Gravity g
-        g = 9.81
+        num_bars = rng.integers(4, 11)
 
         # Height of sensor (random height between 1 and 1.5)
-        h = random.uniform(1,1.5)
+        h = rng.uniform(1, 1.5)
 
-        # Initial velocity at sensor (height h)
-        v0 = (g*(H-h))**0.5
+        # Times at which each bar starts and stops blocking the beam
+        initial_block_times, end_block_times = bar_block_times(h, num_bars, delta_d)
 
-        # Bar velocities
-        velos = [(9.81*(H-h+delta_d*i))**0.5 for i in range(num_bars)]
-        # velos = [H-h+delta_d*i for i in range(num_bars)]
+        # Number of x's and o's
+        num_xo = int(end_block_times[-1]//delta_t) + rng.integers(0, 21)
 
-        # Initial time passing the sensor
-        t0 = (H-h)/((2*g*(H-h))**0.5)
+        # Record result
+        data_dict[trial_str] = xo_string(initial_block_times, end_block_times, delta_t, num_xo, error_prev, rng)
+        
+    # Return data_dict
+    return(data_dict)
 
-        initial_block_times = [t0]
 
-        for i in range(len(velos)):
-            initial_block_times = initial_block_times + [initial_block_times[i] + delta_d/((2*g*(H-h+delta_d*i))**0.5),]
+# Start and end times of each bar interval, for a sensor at height h
+def bar_block_times(h, num_bars, delta_d, H=1.5, g=9.81):
+    
+    # Distance fallen when each bar reaches the sensor
+    fallen = H - h + delta_d*np.arange(num_bars)
 
-        end_block_times = [(H-h+delta_d/2)/((2*g*(H-h))**0.5)]
+    # Initial time passing the sensor, then one step per bar
+    t0 = (H-h)/((2*g*(H-h))**0.5)
+    steps = delta_d/np.sqrt(2*g*fallen)
+    initial_block_times = np.concatenate(([t0], steps)).cumsum()
 
-        for i in range(len(velos)):
-            end_block_times = end_block_times + [initial_block_times[i+1] + delta_d/2/((2*g*(H-h+delta_d/2*i))**0.5),]
+    # Each bar stops blocking the beam half a bar spacing after it started
+    end_first = (H-h+delta_d/2)/((2*g*(H-h))**0.5)
+    half_steps = delta_d/2/np.sqrt(2*g*(H - h + delta_d/2*np.arange(num_bars)))
+    end_block_times = np.concatenate(([end_first], initial_block_times[1:] + half_steps))
 
-        # Number of x's and o's
-        num_xo = end_block_times[-1]//delta_t + random.randint(0, 20)
+    return initial_block_times, end_block_times
 
-        # Create xo_string
-        xo_string = ''
 
-        for xo_num in range(int(num_xo)):
+# Build the x/o/e string of one trial
+def xo_string(initial_block_times, end_block_times, delta_t, num_xo, error_prev, rng):
+    
+    # Sample times
+    times = delta_t*np.arange(num_xo)
 
-            # Character to record
-            char_to_rec = 'o'
+    # Last bar interval that started at or before each sample time. A sample is
+    # inside a bar interval if it is before the latest end among those bars
+    # (the intervals can overlap when the sensor is close to the drop height)
+    last_started = np.searchsorted(initial_block_times, times, side='right') - 1
+    latest_end = np.maximum.accumulate(end_block_times)
+    blocked = (last_started >= 0) & (times <= latest_end[np.maximum(last_started, 0)])
 
-            for i in range(len(end_block_times)):
+    # Character codes: o outside the bars, x inside
+    chars = np.where(blocked, ord('x'), ord('o')).astype(np.uint8)
 
-                # Change to x if we are in a bar interval
-                if delta_t*xo_num >= initial_block_times[i] and delta_t*xo_num <= end_block_times[i]:
-                    char_to_rec = 'x'
+    # Randomly error sometimes according to error prevalence
+    chars[rng.random(num_xo) < error_prev] = ord('e')
 
-            # Randomly error sometimes according to error prevelance
-            if random.uniform(0,1) < error_prev:
-                char_to_rec = 'e'
-                    
-            # Add to string
-            xo_string = xo_string + char_to_rec
-        
-        # Record result
-        data_dict[trial_str] = xo_string
-        
-    # Return data_dict
-    return(data_dict)
+    return chars.tobytes().decode('ascii')
 
 
 # # Delta t
@@ -90,4 +174,11 @@ def gen_data_dict(delta_t, delta_d, error_prev=0.25):
 # delta_d = 0.05
 
 # # Generate data
-# data_dict = gen_data_dict(dt, delta_d)
\ No newline at end of file
+# data_dict = gen_data_dict(dt, delta_d)
+
+
+# Convert the pickle to the .npz format from the command line:
+# python photogate_data.py photogate_data.pkl [photogate_data.npz]
+if __name__ == '__main__':
+    import sys
+    print('Wrote', convert_pickle_to_npz(*sys.argv[1:3]))
@@ -0,0 +1,145 @@
+import socket
+import time
+
+import numpy as np
+
+try:
+    from .photogate_analysis import X, O, E
+except ImportError:
+    from photogate_analysis import X, O, E
+
+
+# Online version of photogate_analysis.estimate_g for data that is still
+# arriving. Feed it chunks of the x/o/e stream (str or bytes, any length,
+# other characters such as newlines are ignored) and read back g.
+#
+# Only a fixed amount of state is kept, whatever the length of the stream:
+# the number of samples seen, whether the beam was last blocked, the time of
+# the last leading edge and the running sums of the straight-line fit of
+# velocity against time. 'e' samples repeat the last good sample (the
+# 'previous' imputation of photogate_analysis).
+#
+# If max_gap is given (in seconds), a gap longer than that between two
+# leading edges is taken as the start of a new drop and the fit restarts.
+class OnlinePhotogate:
+
+    def __init__(self, delta_t, delta_d, max_gap=None):
+        self.delta_t = delta_t
+        self.delta_d = delta_d
+        self.max_gap = max_gap
+        self.num_samples = 0
+        self.num_edges = 0
+        self.blocked = False
+        self.last_edge_time = None
+        self.velocity = None
+        self._reset_fit()
+
+    def _reset_fit(self):
+        # Times are stored relative to the first mid-time of the fit, which
+        # keeps the running sums well conditioned on long streams
+        self._t_ref = None
+        self._n = 0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+
+    @property
+    def num_velocities(self):
+        # Number of velocities in the current fit
+        return self._n
+
+    @property
+    def g(self):
+        # Current estimate of g (nan until there are two velocities)
+        denominator = self._n*self._sum_tt - self._sum_t**2
+        if self._n < 2 or denominator == 0:
+            return float('nan')
+        return (self._n*self._sum_tv - self._sum_t*self._sum_v)/denominator
+
+    def feed(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', errors='ignore')
+        symbols = np.frombuffer(chunk, dtype=np.uint8)
+        symbols = symbols[(symbols == X) | (symbols == O) | (symbols == E)]
+        if len(symbols) == 0:
+            return self.g
+
+        # Fill in the errors from the last good sample, carrying the state over from the previous chunk
+        index = np.arange(len(symbols))
+        source = np.maximum.accumulate(np.where(symbols != E, index, -1))
+        blocked = np.where(source >= 0, symbols[np.maximum(source, 0)] == X, self.blocked)
+
+        # Leading edges, including one between the previous chunk and this one.
+        # As in the batch version, the very first sample of the stream is never an edge
+        before = np.concatenate(([self.blocked], blocked[:-1]))
+        rising = np.flatnonzero(blocked & ~before)
+        if self.num_samples == 0:
+            rising = rising[rising > 0]
+
+        for sample in self.num_samples + rising:
+            self._add_edge(sample*self.delta_t)
+
+        self.num_samples += len(symbols)
+        self.blocked = bool(blocked[-1])
+        return self.g
+
+    def _add_edge(self, t):
+        self.num_edges += 1
+        last = self.last_edge_time
+        self.last_edge_time = t
+        if last is None:
+            return
+        if self.max_gap is not None and t - last > self.max_gap:
+            self._reset_fit()
+            self.velocity = None
+            return
+
+        self.velocity = self.delta_d/(t - last)
+        mid_time = (t + last)/2
+        if self._t_ref is None:
+            self._t_ref = mid_time
+        mid_time -= self._t_ref
+        self._n += 1
+        self._sum_t += mid_time
+        self._sum_v += self.velocity
+        self._sum_tt += mid_time*mid_time
+        self._sum_tv += mid_time*self.velocity
+
+
+# Feed chunks returned by read() into an OnlinePhotogate and yield g every
+# time new leading edges have arrived (once there are enough of them to fit
+# g). read() returns None at the end of the stream; an empty chunk means
+# there is no data yet: wait poll_interval seconds and try again, giving up
+# after idle_timeout seconds without data (or never, if idle_timeout is None)
+def _follow(read, analyser, poll_interval, idle_timeout):
+    idle = 0.0
+    while True:
+        chunk = read()
+        if chunk is None:
+            return
+        if chunk:
+            idle = 0.0
+            num_edges = analyser.num_edges
+            analyser.feed(chunk)
+            if analyser.num_edges > num_edges and analyser.num_velocities >= 2:
+                yield analyser.g
+            continue
+        if idle_timeout is not None and idle >= idle_timeout:
+            return
+        time.sleep(poll_interval)
+        idle += poll_interval
+
+
+# Follow a file that the photogate is still writing to (like 'tail -f') and
+# yield updated estimates of g as the data arrives
+def follow_file(filename, delta_t, delta_d, max_gap=None, poll_interval=0.1, idle_timeout=None, chunk_size=65536):
+    analyser = OnlinePhotogate(delta_t, delta_d, max_gap)
+    with open(filename, 'rb') as f:
+        yield from _follow(lambda: f.read(chunk_size), analyser, poll_interval, idle_timeout)
+
+
+# Same as follow_file for a stream sent over a TCP socket (e.g. a local
+# stand-in for the photogate rig). Stops when the sender closes the connection
+def follow_socket(address, delta_t, delta_d, max_gap=None, chunk_size=65536):
+    analyser = OnlinePhotogate(delta_t, delta_d, max_gap)
+    with socket.create_connection(address) as connection:
+        # recv blocks until there is data and returns b'' once the sender has closed
+        yield from _follow(lambda: connection.recv(chunk_size) or None, analyser, 0, None)
@@ -0,0 +1,76 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .photogate_data import gen_data_dict, pack_trials
+    from .photogate_analysis import estimate_g
+except ImportError:
+    from photogate_data import gen_data_dict, pack_trials
+    from photogate_analysis import estimate_g
+
+# Value of g used by gen_data_dict to simulate the data
+G_TRUE = 9.81
+
+
+# Simulate one batch of trials with gen_data_dict and estimate g for each of them.
+# Runs in a worker process, so it must stay a top-level function
+def _run_task(task):
+    delta_t, delta_d, error_prev, repeat, seed, num_trials, impute = task
+    data_dict = gen_data_dict(delta_t, delta_d, error_prev, seed=seed, num_trials=num_trials)
+    names, symbols, offsets = pack_trials(data_dict)
+    g = estimate_g(symbols, offsets, delta_t, delta_d, impute)
+    return pd.DataFrame({
+        'delta_t': delta_t,
+        'delta_d': delta_d,
+        'error_prev': error_prev,
+        'repeat': repeat,
+        'trial': np.arange(len(g)),
+        'g': g,
+    })
+
+
+# Monte Carlo sweep over every combination of the delta_t, delta_d and
+# error_prev values: for each combination, simulate `repeats` batches of
+# num_trials trials and estimate g for every trial.
+#
+# Every batch gets its own independent random stream, spawned from seed,
+# so the results are the same whatever the number of processes and the same
+# seed always gives the same table. The batches run on a pool of
+# `processes` worker processes (default: one per CPU; 1 runs everything in
+# this process).
+#
+# Returns a tidy DataFrame with one row per simulated trial and columns
+# delta_t, delta_d, error_prev, repeat, trial and g (see summarise_sweep)
+def sweep(delta_t_values, delta_d_values, error_prev_values, num_trials=100, repeats=1, seed=None, impute='previous', processes=None):
+    grid = list(itertools.product(np.atleast_1d(delta_t_values), np.atleast_1d(delta_d_values),
+                                  np.atleast_1d(error_prev_values), range(repeats)))
+    seeds = np.random.SeedSequence(seed).spawn(len(grid))
+    tasks = [(float(dt), float(dd), float(ep), r, s, num_trials, impute) for (dt, dd, ep, r), s in zip(grid, seeds)]
+
+    if processes == 1:
+        tables = [_run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            tables = list(pool.map(_run_task, tasks))
+
+    return pd.concat(tables, ignore_index=True)
+
+
+# Distribution of the estimated g for each parameter combination of a sweep:
+# mean, standard deviation, median, root mean square error with respect to
+# g_true and the fraction of trials where g could not be estimated
+def summarise_sweep(results, g_true=G_TRUE):
+    results = results.assign(squared_error=(results['g'] - g_true)**2, failed=results['g'].isna())
+    summary = results.groupby(['delta_t', 'delta_d', 'error_prev']).agg(
+        trials=('g', 'size'),
+        g_mean=('g', 'mean'),
+        g_std=('g', 'std'),
+        g_median=('g', 'median'),
+        rmse=('squared_error', 'mean'),
+        failed=('failed', 'mean'),
+    )
+    summary['rmse'] = np.sqrt(summary['rmse'])
+    return summary.reset_index()
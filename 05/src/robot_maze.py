@@ -1,9 +1,12 @@
-import random
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle, FancyArrow
 from IPython.display import display, clear_output
 import time
+try:
+    from .maze_ids import new_maze_spec, parse_maze_id, format_maze_id, generate_walls, generate_batch
+except ImportError:
+    from maze_ids import new_maze_spec, parse_maze_id, format_maze_id, generate_walls, generate_batch
 
 class RobotMaze:
     """
@@ -54,30 +57,13 @@ class RobotMaze:
         # Parse or generate maze_id
         if maze_id is None:
             # Generate new maze with given parameters
-            self.size = maze_size
-            self.wall_probability = wall_probability
-            random_seed = int(time.time() * 1000000) % 100000
-            self.maze_id = f"{self.size}-{int(self.wall_probability*100)}-{random_seed}"
+            spec = new_maze_spec(maze_size, wall_probability)
         else:
-            # Parse maze_id to extract parameters
-            try:
-                parts = str(maze_id).split('-')
-                self.size = int(parts[0])
-                self.wall_probability = int(parts[1]) / 100.0
-                random_seed = int(parts[2])
-                self.maze_id = maze_id
-            except (IndexError, ValueError):
-                raise ValueError(
-                    f"Invalid maze_id format: '{maze_id}'. "
-                    f"Expected format: 'size-wallprob-seed' (e.g., '10-30-12345')"
-                )
-        
-        # Create a dedicated RandomState for this maze instance
-        # This is isolated from the global numpy random state
-        self.rng = np.random.RandomState(random_seed)
-        
-        # Also seed Python's random for any operations that might use it
-        random.seed(random_seed)
+            # Parse maze_id to extract parameters (legacy 'size-wallprob-seed' IDs are still accepted)
+            spec = parse_maze_id(maze_id)
+        self.maze_id = format_maze_id(spec)
+        self.size = spec.size
+        self.wall_probability = spec.wall_percent / 100.0
         
         # Set robot start position (top-left)
         self.robot_x = 0
@@ -88,31 +74,10 @@ class RobotMaze:
         self.target_x = self.size - 1
         self.target_y = self.size - 1
         
-        # Generate a solvable maze using our dedicated RNG
-        attempts = 0
-        while attempts < max_attempts:
-            attempts += 1
-            self.maze = np.ones((self.size, self.size), dtype=int) * self.EMPTY
-            
-            # Generate random walls using our dedicated RNG
-            for i in range(self.size):
-                for j in range(self.size):
-                    if self.rng.random() < self.wall_probability:
-                        self.maze[i, j] = self.WALL
-            
-            # Ensure start and target are not walls
-            self.maze[0, 0] = self.EMPTY
-            self.maze[self.target_y, self.target_x] = self.EMPTY
-            
-            # Check if maze is solvable
-            if self._is_solvable():
-                break
-        else:
-            raise RuntimeError(
-                f"Failed to generate a solvable maze after {max_attempts} attempts. "
-                f"Try reducing wall_probability (currently {self.wall_probability}) or "
-                f"increasing maze_size (currently {self.size})."
-            )
+        # Generate a solvable maze from the maze's own random stream
+        # (this does not touch the global numpy or Python random state)
+        walls = generate_walls(spec, max_attempts)
+        self.maze = np.where(walls, self.WALL, self.EMPTY)
         
         self.maze[0, 0] = self.BEEN_THERE
         
@@ -205,7 +170,8 @@ class RobotMaze:
     def get_maze_id(self):
         """
         Returns maze id string that encodes all parameters needed to recreate this exact maze.
-        Format: 'size-wallprobability-seed' (e.g., '10-30-12345')
+        Format: 'v2-size-wallprobability-seed-index' (e.g., 'v2-10-30-9f3a0c1d2b4e5f60-0').
+        Older 'size-wallprobability-seed' IDs (e.g., '10-30-12345') are still accepted by RobotMaze.
         """
         return self.maze_id
     
@@ -587,43 +553,6 @@ class RobotMaze:
             x -= 1
         
         return x, y
-    
-    def _is_solvable(self):
-        """
-        Check if the maze has a path from start (0,0) to target using BFS.
-        
-        Returns:
-            True if a path exists, False otherwise
-        """
-        from collections import deque
-        
-        start = (0, 0)
-        target = (self.target_x, self.target_y)
-        
-        if self.maze[0, 0] == self.WALL or self.maze[target[1], target[0]] == self.WALL:
-            return False
-        
-        visited = set()
-        queue = deque([start])
-        visited.add(start)
-        
-        while queue:
-            x, y = queue.popleft()
-            
-            if (x, y) == target:
-                return True
-            
-            # Check all four directions
-            for dx, dy in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                
-                if (0 <= nx < self.size and 0 <= ny < self.size and
-                    (nx, ny) not in visited and
-                    self.maze[ny, nx] != self.WALL):
-                    visited.add((nx, ny))
-                    queue.append((nx, ny))
-        
-        return False
 
 
 
@@ -668,6 +597,8 @@ if __name__ == "__main__":
     print("  robot2 = RobotMaze(maze_id=my_seed)  # Exact same maze!")
     print("\nVerify reproducibility:")
     print("  verify_maze_reproducibility('10-30-12345')")
+    print("\nMany mazes at once:")
+    print("  maze_ids, walls = generate_batch(100, 10, 0.3)")
     print("\nGraceful interrupt handling:")
     print("  Use run_controller(robot, my_controller)")
     print("  to prevent traceback when pressing stop in Jupyter")
@@ -0,0 +1,131 @@
+"""
+Content-addressed store for the files copied into the quarto/ mirror.
+
+Every distinct file content is stored once, as objects/<sha256[:2]>/<sha256>,
+and materialized at its destination with (in order of preference):
+- a reflink (copy-on-write clone, on filesystems such as Btrfs and XFS),
+- a hard link to the stored object,
+- a plain copy when neither is possible.
+
+Objects are cloned from their source file with a reflink too when the
+filesystem allows, so that they share its blocks; elsewhere (e.g. ext4) they
+are copies and the store takes as much space as one copy of each distinct
+file. They are never hard links to the source: editing a source in place
+must not change an object other files in the mirror may share.
+
+Stored objects are made read-only, so a file materialized as a hard link
+cannot be modified in place by accident (which would change the object for
+every file sharing it); tools that rewrite files by replacing them are fine.
+The store must be on the same filesystem as the destinations for links to
+work, which is why sync_quarto.py keeps it inside quarto/.
+"""
+import errno
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request cloning a whole file (from <linux/fs.h>)
+FICLONE = 0x40049409
+# Errors meaning the filesystem (or the pair of them) cannot make reflinks
+NO_REFLINK = (errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS, errno.EXDEV)
+
+METHODS = ("reflink", "hardlink", "copy")
+
+
+class AssetStore:
+    """A directory of content-addressed objects."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._can_reflink = fcntl is not None
+        self._can_clone_sources = fcntl is not None
+        self._can_hardlink = True
+
+    def object_path(self, digest):
+        return self.directory / "objects" / digest[:2] / digest
+
+    def put(self, source, digest):
+        """
+        Store the content of source (whose SHA-256 is digest), unless it is already there.
+        Returns how it was stored, "reflink" or "copy", or None if it already was.
+        """
+        path = self.object_path(digest)
+        if path.exists():
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        os.close(fd)
+        method = "reflink"
+        if not self._can_clone_sources or not self._try_reflink(source, tmp, "_can_clone_sources"):
+            method = "copy"
+            shutil.copy2(source, tmp)
+        os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp, path)
+        return method
+
+    def materialize(self, digest, output):
+        """Create output with the content of a stored object; returns the method used (see METHODS)."""
+        path = self.object_path(digest)
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if output.exists() or output.is_symlink():
+            output.unlink()
+
+        if self._can_reflink:
+            if self._try_reflink(path, output, "_can_reflink"):
+                return "reflink"
+            output.unlink(missing_ok=True)
+        if self._can_hardlink:
+            try:
+                os.link(path, output)
+                return "hardlink"
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    raise
+                self._can_hardlink = e.errno == errno.EMLINK
+        shutil.copy2(path, output)
+        os.chmod(output, stat.S_IMODE(output.stat().st_mode) | stat.S_IWUSR)
+        return "copy"
+
+    # Reflink source to output; returns False (and clears the flag attribute if
+    # the filesystem cannot do it at all) when that is not possible
+    def _try_reflink(self, source, output, flag):
+        try:
+            _reflink(source, output)
+            return True
+        except OSError as e:
+            if e.errno in NO_REFLINK:
+                setattr(self, flag, False)
+            elif e.errno != errno.EPERM:
+                raise
+            return False
+
+    def objects(self):
+        """Digest -> size of every stored object."""
+        root = self.directory / "objects"
+        if not root.exists():
+            return {}
+        return {p.name: p.stat().st_size for p in root.glob("*/*") if p.is_file() and len(p.name) == 64}
+
+    def prune(self, keep):
+        """Remove the objects whose digest is not in keep; returns the number of bytes freed."""
+        freed = 0
+        for digest, size in self.objects().items():
+            if digest not in keep:
+                self.object_path(digest).unlink()
+                freed += size
+        return freed
+
+
+def _reflink(source, output):
+    with open(source, "rb") as src, open(output, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, output)
+    os.chmod(output, stat.S_IMODE(os.stat(output).st_mode) | stat.S_IWUSR)
@@ -0,0 +1,245 @@
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from copy_slides_to_folders import slide_files
+from sync_quarto import DEST, ROOT, output_name, source_files
+
+# Builds the course site by running the build scripts as a graph of tasks:
+#
+#   sync          numbered folders → quarto/ (sync_quarto.py)
+#   pyodide       {python} → {pyodide} chunks in every .qmd (replace_python_with_pyodide.py)
+#   slides:<deck> quarto/slides/<deck>.qmd → <deck>.ipynb (qmd_to_slides.py)
+#   pptx:<deck>   quarto/slides/<deck>.qmd → <deck>.pptx (qmd_to_pptx_enhanced.sh)
+#   copy-slides   quarto/_site/slides → numbered folders (copy_slides_to_folders.py)
+#
+# A task runs after the tasks it depends on, tasks whose dependencies are done
+# run in parallel, and a task is skipped when the content of its inputs (which
+# include the script it runs) has the same hash as after its last successful
+# run and its outputs exist. Hashes are cached by file size and modification
+# time in a manifest, so unchanged files are not read again.
+#
+# quarto/_site is made by `quarto render`, which is not part of this build.
+MANIFEST_NAME = ".build_manifest.json"
+SLIDES = DEST / "slides"
+SITE_SLIDES = DEST / "_site" / "slides"
+# Directories of quarto/ that hold Quarto's own output, not sources
+GENERATED = {"_site", ".quarto", ".jupyter_cache", ".ipynb_checkpoints", ".assets"}
+
+
+class Task:
+    """
+    A command with its dependencies (task names), inputs and outputs (functions
+    returning paths, called when the task is about to run, after the tasks
+    producing them).
+    """
+
+    def __init__(self, name, command, cwd=ROOT, deps=(), inputs=list, outputs=list):
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.deps = list(deps)
+        self.inputs = inputs
+        self.outputs = outputs
+
+
+def qmd_files():
+    return sorted(p for p in DEST.rglob("*.qmd") if not GENERATED.intersection(p.relative_to(DEST).parts))
+
+
+def site_slides():
+    return list(slide_files(SITE_SLIDES, ROOT)) if SITE_SLIDES.is_dir() else []
+
+
+def decks():
+    return sorted(p for p in SLIDES.glob("*_slides.qmd"))
+
+
+def tasks():
+    python = sys.executable
+    graph = [
+        Task("sync", [python, "sync_quarto.py"],
+             inputs=lambda: [*source_files(ROOT), ROOT / "sync_quarto.py", ROOT / "notebook_to_qmd.py",
+                             ROOT / "asset_store.py"],
+             outputs=lambda: [DEST / output_name(p.relative_to(ROOT)) for p in source_files(ROOT)]),
+        # Rewrites the .qmd files in place: they are both its inputs and its outputs
+        Task("pyodide", [python, "replace_python_with_pyodide.py"], cwd=DEST, deps=["sync"],
+             inputs=lambda: [*qmd_files(), DEST / "replace_python_with_pyodide.py"], outputs=qmd_files),
+    ]
+    pptx = []
+    for deck in decks():
+        stem = deck.stem
+        graph.append(Task(f"slides:{stem}", [python, "qmd_to_slides.py", deck.name], cwd=SLIDES, deps=["pyodide"],
+                          inputs=lambda deck=deck: [deck, *(SLIDES / name for name in ("qmd_to_slides.py", "qmd_parser.py")),
+                                                    ROOT / "notebook_transforms.py"],
+                          outputs=lambda deck=deck: [deck.with_suffix(".ipynb")]))
+        graph.append(Task(f"pptx:{stem}", ["bash", "qmd_to_pptx_enhanced.sh", deck.name], cwd=SLIDES, deps=["pyodide"],
+                          inputs=lambda deck=deck: [deck, SLIDES / "qmd_to_pptx_enhanced.sh"],
+                          outputs=lambda deck=deck: [deck.with_suffix(".pptx")]))
+        pptx.append(f"pptx:{stem}")
+    graph.append(Task("copy-slides", [python, "copy_slides_to_folders.py"], deps=pptx,
+                      inputs=lambda: [*(Path(src) for src, _ in site_slides()), ROOT / "copy_slides_to_folders.py"],
+                      outputs=lambda: [Path(dest) for _, dest in site_slides()]))
+    return {task.name: task for task in graph}
+
+
+# The tasks selected by name or name prefix (e.g. "slides" or "slides:07_intro_numpy_slides"),
+# with all the tasks they depend on
+def select(graph, targets):
+    selected = set()
+    pending = [name for name in graph if not targets
+               or any(name == t or name.startswith(t.rstrip(":") + ":") for t in targets)]
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(graph[name].deps)
+    return [name for name in graph if name in selected]
+
+
+def read_manifest(root=ROOT):
+    try:
+        with open(root / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("files", {})
+    manifest.setdefault("tasks", {})
+    return manifest
+
+
+def write_manifest(manifest, root=ROOT):
+    with open(root / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+# Hash of a file, reusing the cached one while its size and modification time are unchanged
+def cached_hash(path, cache):
+    key = path.relative_to(ROOT).as_posix()
+    stat = path.stat()
+    old = cache.get(key)
+    if old and old[0] == stat.st_size and old[1] == stat.st_mtime_ns:
+        return old[2]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    cache[key] = [stat.st_size, stat.st_mtime_ns, digest]
+    return digest
+
+
+# Hash of a task: its command and the names and content of its inputs
+def task_hash(task, cache):
+    h = hashlib.sha256(json.dumps(task.command).encode())
+    for path in task.inputs():
+        if path.is_file():
+            h.update(f"{path.relative_to(ROOT).as_posix()}\0{cached_hash(path, cache)}\0".encode())
+    return h.hexdigest()
+
+
+def up_to_date(task, manifest):
+    return (manifest["tasks"].get(task.name) == task_hash(task, manifest["files"])
+            and all(path.exists() for path in task.outputs()))
+
+
+def run_task(task):
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(task.command, cwd=task.cwd, capture_output=True, text=True)
+    except OSError as e:
+        return f"{type(e).__name__}: {e}", time.perf_counter() - start
+    if result.returncode != 0:
+        output = (result.stdout + result.stderr).strip().splitlines()
+        return "\n".join([f"exit code {result.returncode}"] + output[-20:]), time.perf_counter() - start
+    return None, time.perf_counter() - start
+
+
+def build(targets=(), jobs=None, force=False, dry_run=False):
+    start = time.perf_counter()
+    graph = tasks()
+    names = select(graph, targets)
+    manifest = read_manifest()
+    done, failed, skipped, would_run = set(), set(), set(), set()
+    waiting = list(names)
+    running = {}
+
+    # A task is ready once all its dependencies ran or were up to date
+    def ready():
+        for name in list(waiting):
+            task = graph[name]
+            if any(dep in failed or dep in skipped for dep in task.deps if dep in names):
+                waiting.remove(name)
+                skipped.add(name)
+                print(f"- {name}: skipped, a dependency failed")
+            elif all(dep in done for dep in task.deps if dep in names):
+                waiting.remove(name)
+                yield task
+
+    ran = 0
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while waiting or running:
+                for task in ready():
+                    # In a dry run nothing is built, so a task also runs when a dependency would
+                    stale = dry_run and any(dep in would_run for dep in task.deps)
+                    if not force and not stale and up_to_date(task, manifest):
+                        done.add(task.name)
+                    elif dry_run:
+                        print(f"  would run {task.name}")
+                        would_run.add(task.name)
+                        done.add(task.name)
+                    else:
+                        print(f"  running {task.name}")
+                        running[pool.submit(run_task, task)] = task
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    error, seconds = future.result()
+                    ran += 1
+                    if error:
+                        failed.add(task.name)
+                        manifest["tasks"].pop(task.name, None)
+                        print(f"✗ {task.name} failed after {seconds:.2f}s: {error}")
+                    else:
+                        done.add(task.name)
+                        # Hashed after the run, for tasks that rewrite their inputs
+                        manifest["tasks"][task.name] = task_hash(task, manifest["files"])
+                        print(f"✓ {task.name} ({seconds:.2f}s)")
+    finally:
+        if not dry_run:
+            write_manifest(manifest)
+
+    if dry_run:
+        print(f"{len(names)} tasks, {len(would_run)} would run")
+        return True
+    print(f"{len(names)} tasks: {ran} run, {len(failed)} failed, {len(skipped)} skipped "
+          f"in {time.perf_counter() - start:.2f}s")
+    return not failed and not skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the course site, running only the steps whose inputs changed.")
+    parser.add_argument("targets", nargs="*",
+                        help="Tasks to build, with their dependencies: sync, pyodide, slides, pptx, copy-slides, "
+                             "or a single deck such as slides:07_intro_numpy_slides (default: everything).")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of tasks run in parallel (default: one per CPU).")
+    parser.add_argument("-f", "--force", action="store_true", help="Run every selected task.")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Only show which tasks would run.")
+    parser.add_argument("-l", "--list", action="store_true", help="List the tasks and their dependencies.")
+    args = parser.parse_args()
+
+    graph = tasks()
+    if args.list:
+        for name in select(graph, args.targets):
+            print(name + (f"  ← {', '.join(graph[name].deps)}" if graph[name].deps else ""))
+        raise SystemExit(0)
+    unknown = [t for t in args.targets if not select(graph, [t])]
+    if unknown:
+        parser.error(f"unknown tasks: {', '.join(unknown)}")
+    if not build(args.targets, jobs=args.jobs, force=args.force, dry_run=args.dry_run):
+        raise SystemExit(1)
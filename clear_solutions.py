@@ -1,18 +1,128 @@
-import nbformat
 import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-parser = argparse.ArgumentParser(description="Clear solutions from notebook cells.")
-parser.add_argument("path", help="Path to the input notebook file.")
-args = parser.parse_args()
-path = args.path
+from notebook_transforms import has_tag, read_notebook, strip_tagged, transform_notebook, write_notebook
 
-nb = nbformat.read(path, as_version=4)
+# Output file name, next to the input notebook. {stem} is the input name without
+# .ipynb, {base} the same without a trailing _solutions/-solutions/-solution
+NAME_RULE = "{stem}_empty_solutions"
+SOLUTION_SUFFIXES = ("_solutions", "-solutions", "_solution", "-solution")
 
-for cell in nb.cells:
-    if "tags" in cell.metadata and "sol" in cell.metadata["tags"]:
-        cell.source = ""
-        if cell.cell_type == "code":
-            cell.outputs = []
-            cell.execution_count = None
+# Records the input hashes of the notebooks already processed, in each directory
+MANIFEST_NAME = ".clear_solutions_manifest.json"
+VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
 
-nbformat.write(nb, "output_empty_solutions.ipynb")
+
+# Output path of an input notebook according to a naming rule
+def output_path(path, name_rule=NAME_RULE):
+    stem = path.stem
+    base = next((stem[:-len(s)] for s in SOLUTION_SUFFIXES if stem.endswith(s)), stem)
+    return path.with_name(name_rule.format(stem=stem, base=base) + ".ipynb")
+
+
+# Notebooks given directly, and all notebooks in the given directory trees
+# (except checkpoints and the outputs of this script)
+def find_notebooks(paths, name_rule=NAME_RULE):
+    notebooks = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            notebooks.update(p for p in path.rglob("*.ipynb") if ".ipynb_checkpoints" not in p.parts)
+        else:
+            notebooks.add(path)
+    outputs = {output_path(p, name_rule) for p in notebooks}
+    return sorted(p for p in notebooks if p not in outputs or output_path(p, name_rule) == p)
+
+
+def file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def read_manifest(directory):
+    try:
+        with open(directory / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(directory, manifest):
+    with open(directory / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+# Blank the cells tagged "sol" of one notebook and write the result (in the
+# same format as nbformat, validated with it if validate is True).
+# Returns the number of cleared cells (nothing is written if there are none)
+def clear_solutions(path, output, validate=False):
+    nb = read_notebook(path)
+    cleared = sum(has_tag(cell, "sol") for cell in nb["cells"])
+    if cleared:
+        write_notebook(transform_notebook(nb, strip_tagged("sol")), output, validate=validate)
+    return cleared
+
+
+def _run(task):
+    path, output, validate = task
+    try:
+        return path, clear_solutions(path, output, validate), None
+    except Exception as e:
+        return path, 0, f"{type(e).__name__}: {e}"
+
+
+# Clear the solutions of many notebooks in parallel, skipping those whose
+# content has not changed since the last run (and whose output still exists)
+def clear_many(notebooks, name_rule=NAME_RULE, jobs=None, force=False, validate=False):
+    manifests = {}
+    tasks = []
+    failures = 0
+    for path in notebooks:
+        manifest = manifests.setdefault(path.parent, read_manifest(path.parent))
+        output = output_path(path, name_rule)
+        if output == path:
+            print(f"✗ {path}: the naming rule would overwrite the input")
+            failures += 1
+            continue
+        entry = {"sha256": file_hash(path), "output": output.name, "version": VERSION}
+        previous = manifest.get(path.name, {})
+        if not force and previous.items() >= entry.items() and (output.exists() or previous.get("cleared") == 0):
+            continue
+        manifest[path.name] = entry
+        tasks.append((path, output, validate))
+    print(f"{len(notebooks)} notebooks, {len(notebooks) - len(tasks) - failures} unchanged, processing {len(tasks)}")
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for path, cleared, error in pool.map(_run, tasks):
+            if error:
+                failures += 1
+                manifests[path.parent].pop(path.name)
+                print(f"✗ {path}: {error}")
+            else:
+                manifests[path.parent][path.name]["cleared"] = cleared
+                if cleared:
+                    print(f"✓ {path} -> {output_path(path, name_rule).name} ({cleared} cells cleared)")
+                else:
+                    print(f"- {path}: no cells tagged 'sol'")
+
+    for directory, manifest in manifests.items():
+        write_manifest(directory, manifest)
+    return failures == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clear solutions from notebook cells.")
+    parser.add_argument("paths", nargs="+", help="Input notebook files and/or directories to search for notebooks.")
+    parser.add_argument("--name", default=NAME_RULE,
+                        help="Output file name (without .ipynb), written next to each input. "
+                             "{stem} is the input name and {base} the input name without a "
+                             f"_solutions suffix (default: {NAME_RULE}).")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of notebooks processed in parallel (default: one per CPU).")
+    parser.add_argument("--force", action="store_true", help="Process notebooks even if they have not changed.")
+    parser.add_argument("--validate", action="store_true", help="Validate the outputs with nbformat before writing them.")
+    args = parser.parse_args()
+
+    if not clear_many(find_notebooks(args.paths, args.name), args.name, args.jobs, args.force, args.validate):
+        raise SystemExit(1)
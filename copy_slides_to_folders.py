@@ -1,25 +1,74 @@
+import argparse
+import filecmp
 import os
 import shutil
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Define the root and slides directory
 root_dir = os.path.dirname(os.path.abspath(__file__))
 slides_dir = os.path.join(root_dir, 'quarto', '_site', 'slides')
 
-# List all html files in the slides directory
-for filename in os.listdir(slides_dir):
-    # Match files with a numerical prefix and underscore, e.g., 07_intro_numpy_slides.html or 07_intro_numpy_slides.pptx
-    match = re.match(r'^(\d+)_([\w\-]+)\.(html|pptx)$', filename)
-    if match:
-        num_prefix = match.group(1)
-        rest = match.group(2)
-        ext = match.group(3)
-        # Prepend 'slides_' and remove the numerical prefix and underscore
-        new_filename = f"slides_{rest}.{ext}"
-        # Destination folder (e.g., 07/)
-        dest_folder = os.path.join(root_dir, num_prefix)
-        os.makedirs(dest_folder, exist_ok=True)
-        src_path = os.path.join(slides_dir, filename)
-        dest_path = os.path.join(dest_folder, new_filename)
+# Match files with a numerical prefix and underscore, e.g., 07_intro_numpy_slides.html or 07_intro_numpy_slides.pptx
+SLIDE_FILE = re.compile(r'^(\d+)_([\w\-]+)\.(html|pptx)$')
+
+
+# (source, destination) of every slide file, e.g. quarto/_site/slides/07_intro_numpy_slides.html
+# goes to 07/slides_intro_numpy_slides.html
+def slide_files(slides_dir=slides_dir, root_dir=root_dir):
+    for filename in sorted(os.listdir(slides_dir)):
+        match = SLIDE_FILE.match(filename)
+        if match:
+            num_prefix, rest, ext = match.groups()
+            # Prepend 'slides_' and remove the numerical prefix and underscore
+            new_filename = f"slides_{rest}.{ext}"
+            yield os.path.join(slides_dir, filename), os.path.join(root_dir, num_prefix, new_filename)
+
+
+# Whether dest already has the content of src: same size and modification time
+# (nothing is read), or same size and identical bytes. In the second case dest
+# gets the modification time of src, so the next run does not read them again.
+def up_to_date(src_path, dest_path, dry_run=False):
+    try:
+        src, dest = os.stat(src_path), os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    if src.st_size != dest.st_size:
+        return False
+    if src.st_mtime_ns == dest.st_mtime_ns:
+        return True
+    if not filecmp.cmp(src_path, dest_path, shallow=False):
+        return False
+    if not dry_run:
+        os.utime(dest_path, ns=(src.st_atime_ns, src.st_mtime_ns))
+    return True
+
+
+def copy_slide(src_path, dest_path, dry_run=False):
+    if up_to_date(src_path, dest_path, dry_run):
+        return False
+    if not dry_run:
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
         shutil.copy2(src_path, dest_path)
-        print(f"Copied {src_path} to {dest_path}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy the rendered slides in quarto/_site/slides to the numbered "
+                                                 "folders, skipping the ones that did not change.")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of files copied in parallel (default: automatic).")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Only show which files would be copied.")
+    args = parser.parse_args()
+
+    files = list(slide_files())
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        copied = list(pool.map(lambda task: copy_slide(*task, dry_run=args.dry_run), files))
+
+    size = 0
+    for (src_path, dest_path), changed in zip(files, copied):
+        if changed:
+            size += os.path.getsize(src_path)
+            print(f"{'Would copy' if args.dry_run else 'Copied'} {src_path} to {dest_path}")
+    n_copied = sum(copied)
+    print(f"{len(files)} slide files: {n_copied} {'to copy' if args.dry_run else 'copied'} "
+          f"({size / 1e6:.1f} MB), {len(files) - n_copied} up to date")
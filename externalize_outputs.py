@@ -0,0 +1,162 @@
+import argparse
+import base64
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from notebook_transforms import dumps_notebook, read_notebook, transform_notebook
+
+# Move the base64 images in notebook outputs to content-addressed files, so that
+# the notebooks become small JSON documents, and put them back on demand.
+#
+# An externalized image is stored once per folder, as _outputs/<sha256>.<ext>
+# next to the notebook. Its output keeps the other entries of the mimebundle
+# (e.g. text/plain) and gets:
+# - a text/markdown entry showing the image file, so Jupyter still displays it
+#   (unless the output already has a markdown or HTML entry)
+# - metadata recording what was externalized, used to reinline it exactly:
+#     "externalized": {"files": {"image/png": "_outputs/<sha256>.png"},
+#                      "newline": ["image/png"],          # base64 ended with "\n"
+#                      "placeholder": "text/markdown"}   # entry added above
+OUTPUTS_DIR = "_outputs"
+IMAGE_TYPES = {"image/png": ".png", "image/jpeg": ".jpg", "image/gif": ".gif"}
+MIN_SIZE = 1024
+
+
+# Transform moving the images of a cell's outputs to files in directory (the notebook's folder)
+def externalize_images(directory, min_size=MIN_SIZE):
+    directory = Path(directory)
+
+    def transform(cell):
+        if cell.get("cell_type") != "code" or not cell.get("outputs"):
+            return cell
+        outputs = [_externalize(output, directory, min_size) for output in cell["outputs"]]
+        return dict(cell, outputs=outputs)
+    return transform
+
+
+def _externalize(output, directory, min_size):
+    data = output.get("data", {})
+    files, newline = {}, []
+    for mime, extension in IMAGE_TYPES.items():
+        value = data.get(mime)
+        if not isinstance(value, str) or len(value) < min_size:
+            continue
+        raw = base64.b64decode(value)
+        encoded = base64.b64encode(raw).decode("ascii")
+        # Only images whose base64 text can be rebuilt exactly
+        if value not in (encoded, encoded + "\n"):
+            continue
+        name = f"{OUTPUTS_DIR}/{hashlib.sha256(raw).hexdigest()}{extension}"
+        path = directory / name
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(raw)
+        files[mime] = name
+        if value != encoded:
+            newline.append(mime)
+    if not files:
+        return output
+
+    data = {mime: value for mime, value in data.items() if mime not in files}
+    record = {"files": files}
+    if newline:
+        record["newline"] = newline
+    if "text/markdown" not in data and "text/html" not in data:
+        data["text/markdown"] = "".join(f"![]({name})" for name in files.values())
+        record["placeholder"] = "text/markdown"
+    return dict(output, data=data, metadata=dict(output.get("metadata", {}), externalized=record))
+
+
+# Transform putting back the images externalized from a notebook in directory
+def reinline_images(directory):
+    directory = Path(directory)
+
+    def transform(cell):
+        if cell.get("cell_type") != "code" or not cell.get("outputs"):
+            return cell
+        return dict(cell, outputs=[_reinline(output, directory) for output in cell["outputs"]])
+    return transform
+
+
+def _reinline(output, directory):
+    metadata = output.get("metadata", {})
+    record = metadata.get("externalized")
+    if not record:
+        return output
+    data = dict(output.get("data", {}))
+    if "placeholder" in record:
+        data.pop(record["placeholder"], None)
+    for mime, name in record["files"].items():
+        encoded = base64.b64encode((directory / name).read_bytes()).decode("ascii")
+        data[mime] = encoded + ("\n" if mime in record.get("newline", ()) else "")
+    metadata = {key: value for key, value in metadata.items() if key != "externalized"}
+    return dict(output, data=data, metadata=metadata)
+
+
+# Externalize (or reinline) the images of one notebook; writes it only if an
+# output changed and returns its size before and after
+def process(path, reinline=False, min_size=MIN_SIZE):
+    path = Path(path)
+    size = path.stat().st_size
+    notebook = read_notebook(path)
+    transform = reinline_images(path.parent) if reinline else externalize_images(path.parent, min_size)
+    transformed = transform_notebook(notebook, transform)
+    if transformed["cells"] == notebook["cells"]:
+        return size, size
+    text = dumps_notebook(transformed)
+    path.write_text(text, encoding="utf-8")
+    return size, len(text.encode("utf-8"))
+
+
+# Notebooks given directly, and the notebooks below the given directories (not in
+# hidden ones such as .ipynb_checkpoints or Quarto's .jupyter_cache)
+def find_notebooks(paths):
+    notebooks = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            notebooks.update(p for p in path.rglob("*.ipynb")
+                             if not any(part.startswith(".") for part in p.relative_to(path).parts[:-1]))
+        else:
+            notebooks.add(path)
+    return sorted(notebooks)
+
+
+def _run(task):
+    path, reinline, min_size = task
+    try:
+        return path, process(path, reinline, min_size), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move the images in notebook outputs to content-addressed files "
+                                                 f"in {OUTPUTS_DIR}/ next to the notebooks, or put them back.")
+    parser.add_argument("paths", nargs="+", help="Notebooks and/or directories to search for them.")
+    parser.add_argument("--reinline", action="store_true", help="Put the externalized images back into the notebooks.")
+    parser.add_argument("--min-size", type=int, default=MIN_SIZE,
+                        help=f"Leave images smaller than this many base64 characters inline (default: {MIN_SIZE}).")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of notebooks processed in parallel (default: one per CPU).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    notebooks = find_notebooks(args.paths)
+    failures = 0
+    total_before = total_after = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for path, sizes, error in pool.map(_run, [(p, args.reinline, args.min_size) for p in notebooks]):
+            if error:
+                failures += 1
+                print(f"✗ {path}: {error}")
+                continue
+            before, after = sizes
+            total_before += before
+            total_after += after
+            if before != after:
+                print(f"✓ {path}: {before / 1e6:.2f} MB → {after / 1e6:.2f} MB")
+    print(f"{len(notebooks)} notebooks: {total_before / 1e6:.1f} MB → {total_after / 1e6:.1f} MB "
+          f"in {time.perf_counter() - start:.2f}s" + (f", {failures} failed" if failures else ""))
+    if failures:
+        raise SystemExit(1)
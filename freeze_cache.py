@@ -0,0 +1,143 @@
+import argparse
+import shutil
+import sqlite3
+from pathlib import Path
+
+from sync_quarto import DEST
+
+# Inspect and prune the execution caches Quarto keeps in quarto/*/.jupyter_cache
+# (a jupyter-cache database, global.db, and one executed/<hashkey>/base.ipynb
+# per cached execution).
+#
+# Every entry of a cache is mapped to its source document (<name>.quarto_ipynb
+# is <name>.qmd in the same folder) and classified:
+#   current   the most recently used execution of an existing document (the
+#             one Quarto last read or wrote, by the database's accessed time;
+#             an older execution can become current again when a document is
+#             reverted to it)
+#   stale     another execution of a document, not used since the current one
+#   orphaned  an execution of a document that no longer exists
+#   broken    a database entry whose notebook directory is missing
+#   stray     a notebook directory the database does not know about
+# Current entries are kept; with --prune the others are removed, database rows
+# first (in one transaction per cache), then their directories. Do not prune
+# while quarto render is running.
+#
+# The .ipynb_checkpoints directories below quarto/ (copies of notebooks Jupyter
+# saved there, never used by the site) are reported and pruned as well.
+CACHE_DIR = ".jupyter_cache"
+KEEP = "current"
+MB = 1024 * 1024
+
+
+def find_caches(dest=DEST):
+    return sorted(p for p in dest.rglob(CACHE_DIR) if (p / "global.db").is_file())
+
+
+def find_checkpoints(dest=DEST):
+    return sorted(p for p in dest.rglob(".ipynb_checkpoints") if p.is_dir())
+
+
+def source_document(folder, uri):
+    name = uri[:-len(".quarto_ipynb")] + ".qmd" if uri.endswith(".quarto_ipynb") else uri
+    return folder / name
+
+
+def directory_size(path):
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+# Entries of one cache: dicts with hashkey, uri, source, created, accessed, status and bytes
+def inspect_cache(cache):
+    folder = cache.parent
+    executed = cache / "executed"
+    with sqlite3.connect(f"file:{cache / 'global.db'}?mode=ro", uri=True) as db:
+        rows = db.execute("SELECT hashkey, uri, created, accessed FROM nbcache ORDER BY created").fetchall()
+
+    # The most recently accessed execution of each document (ties go to the later one)
+    latest = {}
+    for hashkey, uri, created, accessed in sorted(rows, key=lambda row: (row[3], row[2])):
+        latest[uri] = hashkey
+    entries = []
+    for hashkey, uri, created, accessed in rows:
+        source = source_document(folder, uri)
+        directory = executed / hashkey
+        if not directory.is_dir():
+            status = "broken"
+        elif not source.exists():
+            status = "orphaned"
+        elif latest[uri] != hashkey:
+            status = "stale"
+        else:
+            status = KEEP
+        entries.append({"hashkey": hashkey, "uri": uri, "source": source, "created": created, "accessed": accessed,
+                        "status": status, "bytes": directory_size(directory) if directory.is_dir() else 0})
+
+    known = {hashkey for hashkey, *_ in rows}
+    if executed.is_dir():
+        for directory in sorted(executed.iterdir()):
+            if directory.is_dir() and directory.name not in known:
+                entries.append({"hashkey": directory.name, "uri": None, "source": None, "created": None,
+                                "accessed": None, "status": "stray", "bytes": directory_size(directory)})
+    return entries
+
+
+def prune_cache(cache, entries):
+    """Remove the entries that are not current from a cache; returns the number of bytes freed."""
+    remove = [e for e in entries if e["status"] != KEEP]
+    rows = [(e["hashkey"],) for e in remove if e["status"] != "stray"]
+    if rows:
+        with sqlite3.connect(cache / "global.db") as db:
+            db.executemany("DELETE FROM nbcache WHERE hashkey = ?", rows)
+    for entry in remove:
+        directory = cache / "executed" / entry["hashkey"]
+        if directory.is_dir():
+            shutil.rmtree(directory)
+    return sum(e["bytes"] for e in remove)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the stale and orphaned entries of Quarto's execution "
+                                                 "caches (quarto/*/.jupyter_cache) and optionally prune them.")
+    parser.add_argument("paths", nargs="*", type=Path, default=[DEST],
+                        help="Directories to search for caches (default: quarto/).")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every entry.")
+    parser.add_argument("--prune", action="store_true", help="Remove every entry that is not current.")
+    args = parser.parse_args()
+
+    totals = {}
+    freed = 0
+    for cache in sorted({c for path in args.paths for c in find_caches(path)}):
+        entries = inspect_cache(cache)
+        by_status = {}
+        for entry in entries:
+            count, size = by_status.get(entry["status"], (0, 0))
+            by_status[entry["status"]] = (count + 1, size + entry["bytes"])
+            count, size = totals.get(entry["status"], (0, 0))
+            totals[entry["status"]] = (count + 1, size + entry["bytes"])
+        print(f"{cache}: " + ", ".join(f"{count} {status} ({size / MB:.1f} MB)"
+                                       for status, (count, size) in sorted(by_status.items())))
+        if args.verbose:
+            for entry in entries:
+                source = entry["source"].name if entry["source"] else "-"
+                print(f"  {entry['status']:8s} {entry['hashkey']} {entry['bytes'] / MB:6.2f} MB  {source}")
+        if args.prune:
+            freed += prune_cache(cache, entries)
+
+    checkpoints = sorted({c for path in args.paths for c in find_checkpoints(path)})
+    if checkpoints:
+        size = sum(directory_size(c) for c in checkpoints)
+        totals["checkpoints"] = (len(checkpoints), size)
+        print(f"{len(checkpoints)} .ipynb_checkpoints directories ({size / MB:.1f} MB)")
+        if args.prune:
+            for directory in checkpoints:
+                shutil.rmtree(directory)
+            freed += size
+
+    removable = sum(size for status, (_, size) in totals.items() if status != KEEP)
+    print("Total: " + ", ".join(f"{count} {status} ({size / MB:.1f} MB)"
+                                for status, (count, size) in sorted(totals.items())))
+    if args.prune:
+        print(f"Pruned {freed / MB:.1f} MB")
+    elif removable:
+        print(f"{removable / MB:.1f} MB could be pruned with --prune")
@@ -0,0 +1,341 @@
+"""
+A pool of Jupyter kernels kept warm with the course's common imports.
+
+Starting a kernel and importing numpy, pandas, matplotlib and seaborn takes
+seconds; a pooled kernel has already done both, so a notebook run on it only
+pays for its own code. Between uses the kernel is reset: the user namespace
+is cleared, figures are closed, the settings of matplotlib, numpy (print
+options and floating point error handling), pandas and the warnings filters,
+sys.path and the working directory are restored, the random generators are
+reseeded and modules imported from outside the Python installation (e.g. a
+folder's src/) are forgotten. The imported libraries stay loaded. Kernels that died, were used max_uses times or were given back
+with an exception (e.g. a cell that timed out, which may still be running)
+are replaced in the background.
+
+    with KernelPool(size=4) as pool:
+        with pool.kernel(cwd="10") as km:
+            NotebookClient(notebook, km=km).execute()
+
+The kernels are AsyncKernelManagers, as nbclient expects: a blocking
+manager would stall nbclient's event loop while it waits for messages,
+defeating its per-cell timeout and its checks that the kernel is alive. The
+pool's own work on them (starting, warming up, resetting, shutting down) runs
+on an event loop of its own, in a background thread.
+
+Needs jupyter_client and a kernel (ipykernel). Run this file to compare the
+time to a first cell's result on a new kernel and on a pooled one:
+
+    python kernel_pool.py --size 2 --repeat 5
+"""
+import argparse
+import asyncio
+import queue
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+MODULES = ("numpy", "pandas", "matplotlib", "matplotlib.pyplot", "seaborn")
+
+# Run in a new kernel: import the modules (if installed) and remember the state
+# the reset goes back to, in a module so that resetting the namespace keeps it
+PRELOAD_CODE = """\
+import importlib, os, site, sys, sysconfig, types, warnings
+_pool = sys.modules.setdefault("_kernel_pool", types.ModuleType("_kernel_pool"))
+for _name in {modules!r}:
+    try:
+        importlib.import_module(_name)
+    except ImportError:
+        pass
+_pool.cwd = os.getcwd()
+_pool.path = list(sys.path)
+_pool.modules = set(sys.modules)
+# Where installed modules live: the others come from the notebooks' folders
+_pool.installed = tuple(set(sysconfig.get_paths().values()) | set(site.getsitepackages()) | {{site.getusersitepackages()}})
+_pool.filters = list(warnings.filters)
+if "matplotlib" in sys.modules:
+    _pool.rc = sys.modules["matplotlib"].rcParams.copy()
+if "numpy" in sys.modules:
+    _pool.printoptions = sys.modules["numpy"].get_printoptions()
+    _pool.err = sys.modules["numpy"].geterr()
+get_ipython().reset(new_session=True)
+"""
+
+# Run after each use
+RESET_CODE = """\
+import os, random, sys, warnings
+_pool = sys.modules["_kernel_pool"]
+if "matplotlib.pyplot" in sys.modules:
+    sys.modules["matplotlib.pyplot"].close("all")
+if hasattr(_pool, "rc"):
+    sys.modules["matplotlib"].rcParams.update(_pool.rc)
+if hasattr(_pool, "printoptions"):
+    sys.modules["numpy"].set_printoptions(**_pool.printoptions)
+    sys.modules["numpy"].seterr(**_pool.err)
+if "numpy" in sys.modules:
+    sys.modules["numpy"].random.seed()
+random.seed()
+if "pandas" in sys.modules:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        sys.modules["pandas"].reset_option("all")
+warnings.resetwarnings()
+warnings.filters[:] = _pool.filters
+os.chdir(_pool.cwd)
+sys.path[:] = _pool.path
+for _name, _module in list(sys.modules.items()):
+    _file = getattr(_module, "__file__", None)
+    if _name not in _pool.modules and _file and not _file.startswith(_pool.installed):
+        del sys.modules[_name]
+get_ipython().reset(new_session=True)
+"""
+
+
+class KernelError(RuntimeError):
+    """A pooled kernel could not be started, warmed up or reset."""
+
+
+class PooledKernel:
+    def __init__(self, manager, client, started):
+        self.manager = manager
+        self.client = client
+        self.uses = 0
+        # Seconds it took to start and warm up
+        self.started = started
+
+
+class KernelPool:
+    """Keeps `size` warm kernels; hand them out with `kernel()`."""
+
+    def __init__(self, size=2, kernel_name="python3", modules=MODULES, max_uses=20, timeout=120):
+        self.size = size
+        self.kernel_name = kernel_name
+        self.modules = tuple(modules)
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self._idle = queue.Queue()
+        self._starter = ThreadPoolExecutor(max_workers=size, thread_name_prefix="kernel-pool")
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="kernel-pool-loop", daemon=True)
+        self._lock = threading.Lock()
+        self._kernels = set()
+        self._shutdowns = []
+        self._closed = False
+
+    def start(self):
+        """Start filling the pool (kernels are started in the background)."""
+        # Imported here rather than by the starter threads, which could race importing it
+        from jupyter_client import AsyncKernelManager
+
+        self._manager_class = AsyncKernelManager
+        self._loop_thread.start()
+        for _ in range(self.size):
+            self._starter.submit(self._add_kernel)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Run a coroutine on the pool's event loop, where the kernels' managers and
+    # the pool's clients live, and wait for its result
+    def _await(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _add_kernel(self):
+        try:
+            kernel = self._await(self._start_kernel())
+        except Exception as e:
+            # Raised by the kernel() call waiting for it
+            self._idle.put(KernelError(f"could not start a {self.kernel_name} kernel: {e}"))
+            return
+        with self._lock:
+            if self._closed:
+                self._await(_shutdown(kernel))
+                return
+            self._kernels.add(kernel)
+        self._idle.put(kernel)
+
+    async def _start_kernel(self):
+        start = time.perf_counter()
+        manager = self._manager_class(kernel_name=self.kernel_name)
+        await manager.start_kernel()
+        # A session id of its own: clients made by manager.client() (such as
+        # nbclient's) share the manager's, which is also their socket identity,
+        # so the kernel would send this client's replies to the last of them
+        session = manager.session.clone()
+        session.session = str(uuid.uuid4())
+        client = manager.client(session=session)
+        try:
+            client.start_channels()
+            await client.wait_for_ready(timeout=self.timeout)
+            await _run(client, PRELOAD_CODE.format(modules=self.modules), self.timeout)
+        except Exception:
+            await _shutdown(PooledKernel(manager, client, 0))
+            raise
+        return PooledKernel(manager, client, time.perf_counter() - start)
+
+    @contextmanager
+    def kernel(self, cwd=None, timeout=None):
+        """
+        Context manager lending a warm kernel's AsyncKernelManager, in directory
+        cwd. Waits for one to be free (at most timeout seconds, raising
+        queue.Empty). The borrower makes its own client (as nbclient does) and
+        must not shut the kernel down.
+        """
+        kernel = self._idle.get(timeout=timeout)
+        if isinstance(kernel, Exception):
+            # Try to start one again for the next caller
+            self._starter.submit(self._add_kernel)
+            raise kernel
+        if cwd is not None:
+            try:
+                self._await(_run(kernel.client, f"import os; os.chdir({str(cwd)!r})", self.timeout))
+            except KernelError:
+                self._replace(kernel)
+                raise
+        try:
+            yield kernel.manager
+        except BaseException:
+            # The kernel may still be busy (e.g. running a cell that timed out)
+            self._replace(kernel)
+            raise
+        self._release(kernel)
+
+    # Reset a kernel and put it back in the pool, or replace it
+    def _release(self, kernel):
+        kernel.uses += 1
+        if self._closed or kernel.uses >= self.max_uses or not self._await(kernel.manager.is_alive()):
+            self._replace(kernel)
+            return
+        try:
+            self._await(_run(kernel.client, RESET_CODE, self.timeout))
+        except KernelError:
+            self._replace(kernel)
+        else:
+            _reset_peak_memory(kernel.manager)
+            self._idle.put(kernel)
+
+    def _replace(self, kernel):
+        with self._lock:
+            self._kernels.discard(kernel)
+            closed = self._closed
+        # In the background, close() waits for it
+        self._shutdowns.append(asyncio.run_coroutine_threadsafe(_shutdown(kernel), self._loop))
+        if not closed:
+            self._starter.submit(self._add_kernel)
+
+    def close(self):
+        """Shut down every kernel of the pool."""
+        with self._lock:
+            self._closed = True
+            kernels = list(self._kernels)
+            self._kernels.clear()
+        self._starter.shutdown(wait=True)
+        if not self._loop_thread.is_alive():
+            self._loop.close()
+            return
+        for kernel in kernels:
+            self._shutdowns.append(asyncio.run_coroutine_threadsafe(_shutdown(kernel), self._loop))
+        for future in self._shutdowns:
+            future.result()
+        self._shutdowns.clear()
+        # Let go of the shut down kernels still queued, before their event loop is closed
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+
+
+# Execute code silently on a kernel (with an AsyncKernelClient), raising KernelError if it fails
+async def _run(client, code, timeout):
+    try:
+        reply = await client.execute_interactive(code, silent=True, store_history=False, timeout=timeout)
+    except TimeoutError as e:
+        raise KernelError(f"kernel did not answer in {timeout}s") from e
+    content = reply["content"]
+    if content["status"] != "ok":
+        raise KernelError(f"{content.get('ename')}: {content.get('evalue')}")
+    return reply
+
+
+# Reset the peak resident memory (VmHWM) of a kernel's process to its current
+# size, so that the next borrower measures its own peak (Linux only)
+def _reset_peak_memory(manager):
+    process = getattr(getattr(manager, "provisioner", None), "process", None)
+    try:
+        with open(f"/proc/{process.pid}/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except (OSError, AttributeError):
+        pass
+
+
+async def _shutdown(kernel):
+    try:
+        kernel.client.stop_channels()
+        await kernel.manager.shutdown_kernel(now=True)
+    except Exception:
+        pass
+
+
+# Run code on the kernel of an AsyncKernelManager with a client of its own
+async def _first_cell(manager, code, timeout):
+    client = manager.client()
+    client.start_channels()
+    try:
+        await client.wait_for_ready(timeout=timeout)
+        await _run(client, code, timeout)
+    finally:
+        client.stop_channels()
+
+
+async def _first_cell_new_kernel(kernel_name, code, timeout):
+    from jupyter_client import AsyncKernelManager
+
+    manager = AsyncKernelManager(kernel_name=kernel_name)
+    await manager.start_kernel()
+    try:
+        await _first_cell(manager, code, timeout)
+    finally:
+        await manager.shutdown_kernel(now=True)
+
+
+# Seconds from asking for a kernel to the result of a first cell (code),
+# with a new kernel and with a warm kernel from the pool
+def first_cell_latency(pool, code, repeat=3):
+    cold, warm = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(_first_cell_new_kernel(pool.kernel_name, code, pool.timeout))
+        cold.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with pool.kernel() as manager:
+            asyncio.run(_first_cell(manager, code, pool.timeout))
+            warm.append(time.perf_counter() - start)
+    return cold, warm
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the time to a first cell's result on new and pooled kernels.")
+    parser.add_argument("--size", type=int, default=2, help="Number of warm kernels (default: 2).")
+    parser.add_argument("-k", "--kernel", default="python3", help="Kernel to start (default: python3).")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs (default: 3).")
+    parser.add_argument("--code", default="\n".join(f"import {m}" for m in MODULES if "." not in m),
+                        help="First cell to run (default: the common imports).")
+    args = parser.parse_args()
+
+    with KernelPool(args.size, args.kernel) as pool:
+        try:
+            cold, warm = first_cell_latency(pool, args.code, args.repeat)
+        except (ImportError, KernelError) as e:
+            sys.exit(f"✗ {e}")
+    print(f"new kernel:    {statistics.median(cold):6.2f}s (median of {len(cold)})")
+    print(f"pooled kernel: {statistics.median(warm):6.2f}s (median of {len(warm)}), "
+          f"{statistics.median(cold) / statistics.median(warm):.0f}x faster")
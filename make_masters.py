@@ -0,0 +1,100 @@
+import argparse
+import copy
+from pathlib import Path
+
+from make_variants import MASTER_SUFFIX, VARIANTS
+from notebook_transforms import dumps_notebook, read_notebook, transform_notebook
+
+# One-off step tagging the existing weekly notebooks for make_variants.py:
+# builds <base>_master.ipynb from <base>_solutions.ipynb and
+# <base>_solutions_demonstrator_version.ipynb. The master has all the cells of
+# the solutions notebook, untagged, so its solutions version is that notebook
+# unchanged, plus the demonstrator notes tagged "demo":
+# - cells that are only in the demonstrator version are tagged demo
+# - a demonstrator cell that extends a solutions cell (a note appended to the
+#   same text) becomes that cell followed by the appended text in a demo cell
+# Other differences (titles, table of contents links) cannot be expressed with
+# tags, the master keeps the solutions text and they are listed.
+# No cell is tagged "sol": these notebooks have no student version.
+DEMONSTRATOR_SUFFIX = "_solutions_demonstrator_version"
+
+
+def _text(cell):
+    source = cell.get("source", "")
+    return source if isinstance(source, str) else "".join(source)
+
+
+def _tagged(cell, tag):
+    cell = copy.deepcopy(cell)
+    tags = cell.setdefault("metadata", {}).setdefault("tags", [])
+    if tag not in tags:
+        tags.append(tag)
+    return cell
+
+
+# Returns the master notebook and the ids of the demonstrator cells whose
+# changes to the solutions cell were not kept
+def master_from_versions(solutions, demonstrator):
+    cells = solutions["cells"]
+    index = {cell.get("id"): i for i, cell in enumerate(cells)}
+    if None in index or any(cell.get("id") is None for cell in demonstrator["cells"]):
+        raise ValueError("both notebooks need cell ids (nbformat 4.5), upgrade them with nbformat first")
+
+    master_cells, differences, next_cell = [], [], 0
+    for cell in demonstrator["cells"]:
+        i = index.get(cell["id"])
+        if i is None:
+            master_cells.append(_tagged(cell, "demo"))
+            continue
+        if i < next_cell:
+            raise ValueError(f"cell {cell['id']} is out of order in the demonstrator version")
+        master_cells.extend(cells[next_cell:i + 1])
+        next_cell = i + 1
+
+        solution = cells[i]
+        if cell == solution:
+            continue
+        text, solution_text = _text(cell), _text(solution)
+        if cell["cell_type"] == "markdown" and text.startswith(solution_text) and text != solution_text:
+            note = {"cell_type": "markdown", "id": f"{cell['id']}-demo", "metadata": {},
+                    "source": text[len(solution_text):].lstrip("\n")}
+            master_cells.append(_tagged(note, "demo"))
+        else:
+            differences.append(cell["id"])
+    master_cells.extend(cells[next_cell:])
+
+    master = dict(solutions, cells=master_cells)
+    if transform_notebook(master, *VARIANTS["solutions"][1]())["cells"] != cells:
+        raise ValueError("the master's solutions version differs from the solutions notebook")
+    return master, differences
+
+
+# Solutions notebooks that have a demonstrator version next to them
+def find_pairs(paths):
+    pairs = []
+    for path in map(Path, paths):
+        for demonstrator in sorted(path.rglob(f"*{DEMONSTRATOR_SUFFIX}.ipynb") if path.is_dir() else [path]):
+            base = demonstrator.stem[:-len(DEMONSTRATOR_SUFFIX)]
+            solutions = demonstrator.with_name(f"{base}_solutions.ipynb")
+            if solutions.exists():
+                pairs.append((solutions, demonstrator, demonstrator.with_name(f"{base}{MASTER_SUFFIX}.ipynb")))
+    return pairs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build tagged master notebooks from existing solutions and "
+                                                 "demonstrator versions (<name>_solutions_demonstrator_version.ipynb).")
+    parser.add_argument("paths", nargs="+", help="Demonstrator versions and/or directories to search for them.")
+    parser.add_argument("--force", action="store_true", help="Overwrite existing master notebooks.")
+    args = parser.parse_args()
+
+    for solutions, demonstrator, output in find_pairs(args.paths):
+        if output.exists() and not args.force:
+            print(f"✗ {output} exists, use --force to overwrite it")
+            continue
+        master, differences = master_from_versions(read_notebook(solutions), read_notebook(demonstrator))
+        output.write_text(dumps_notebook(master), encoding="utf-8")
+        demo = sum("demo" in cell["metadata"].get("tags", ()) for cell in master["cells"])
+        print(f"✓ {output}: {demo} demo cells")
+        if differences:
+            print(f"  ! kept the solutions text of cells {', '.join(differences)}")
@@ -0,0 +1,117 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from notebook_transforms import (drop_tagged, dumps_notebook, has_tag, read_notebook, retag_slides, strip_tagged,
+                                 transform_notebook, untag)
+
+# Generate the student, solutions, demonstrator and slides versions of a
+# notebook from one master notebook, <name>_master.ipynb, whose cells are tagged:
+#   sol      solution cells: blanked in the student version (code cells are
+#            replaced by CODE_PLACEHOLDER)
+#   demo     demonstrator notes: only kept in the demonstrator version
+#   noslides cells left out of the slides
+# Only the tags count, untagged cells are in every version. The demo and
+# noslides tags are removed from the generated notebooks.
+MASTER_SUFFIX = "_master"
+CODE_PLACEHOLDER = "# Your code here"
+MASTER_TAGS = ("demo", "noslides")
+
+
+# Slides: cells without slide metadata are split at ## headers and tagged as
+# slides, cells that already have it are kept as they are (unless skipped)
+def slides():
+    retag = retag_slides("## ")
+
+    def transform(cell):
+        slideshow = cell.get("metadata", {}).get("slideshow")
+        if slideshow:
+            return None if slideshow.get("slide_type") == "skip" else cell
+        return retag(cell)
+    return transform
+
+
+# Variant name -> (output file name, transforms applied to the master's cells)
+VARIANTS = {
+    "student": ("{base}.ipynb", lambda: [drop_tagged("demo"), strip_tagged("sol", CODE_PLACEHOLDER)]),
+    "solutions": ("{base}_solutions.ipynb", lambda: [drop_tagged("demo")]),
+    "demonstrator": ("{base}_solutions_demonstrator_version.ipynb", lambda: []),
+    "slides": ("{base}_slides.ipynb", lambda: [drop_tagged("demo"), drop_tagged("noslides"), slides()]),
+}
+
+
+# Master notebooks given directly, and all master notebooks in the given directory trees
+def find_masters(paths):
+    masters = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            masters.update(p for p in path.rglob(f"*{MASTER_SUFFIX}.ipynb") if ".ipynb_checkpoints" not in p.parts)
+        else:
+            masters.add(path)
+    return sorted(masters)
+
+
+# Write all requested variants of one master notebook, parsing it once.
+# Files whose content would not change are not rewritten.
+# A student version needs solution cells tagged "sol": without them it would
+# be the full solutions notebook, so that raises a ValueError.
+# Returns the list of (variant, output path, written)
+def make_variants(master, variants=tuple(VARIANTS)):
+    master = Path(master)
+    base = master.stem[:-len(MASTER_SUFFIX)] if master.stem.endswith(MASTER_SUFFIX) else master.stem
+    notebook = read_notebook(master)
+    if "student" in variants and not any(has_tag(cell, "sol") for cell in notebook.get("cells", [])):
+        raise ValueError(f"{master} has no cells tagged 'sol', its student version would contain the solutions")
+
+    results = []
+    for variant in variants:
+        name, transforms = VARIANTS[variant]
+        output = master.with_name(name.format(base=base))
+        if output == master:
+            raise ValueError(f"the {variant} version would overwrite the master, name it <name>{MASTER_SUFFIX}.ipynb")
+        text = dumps_notebook(transform_notebook(notebook, *transforms(), untag(*MASTER_TAGS)))
+        try:
+            unchanged = output.read_text(encoding="utf-8") == text
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            output.write_text(text, encoding="utf-8")
+        results.append((variant, output, not unchanged))
+    return results
+
+
+def _run(task):
+    master, variants = task
+    try:
+        return master, make_variants(master, variants), None
+    except Exception as e:
+        return master, [], f"{type(e).__name__}: {e}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate student, solutions, demonstrator and slides notebooks "
+                                                 "from tagged master notebooks (<name>_master.ipynb).")
+    parser.add_argument("paths", nargs="+", help="Master notebooks and/or directories to search for them.")
+    parser.add_argument("--variants", default=",".join(VARIANTS),
+                        help=f"Comma-separated variants to generate (default: {','.join(VARIANTS)}).")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of masters processed in parallel (default: one per CPU).")
+    args = parser.parse_args()
+
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    unknown = [v for v in variants if v not in VARIANTS]
+    if unknown:
+        parser.error(f"unknown variants: {', '.join(unknown)}")
+
+    masters = find_masters(args.paths)
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for master, results, error in pool.map(_run, [(m, variants) for m in masters]):
+            if error:
+                failures += 1
+                print(f"✗ {master}: {error}")
+                continue
+            written = [output.name for _, output, changed in results if changed]
+            print(f"✓ {master}: " + (f"wrote {', '.join(written)}" if written else "all variants up to date"))
+    print(f"{len(masters)} master notebooks, {failures} failed")
+    if failures:
+        raise SystemExit(1)
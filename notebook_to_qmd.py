@@ -0,0 +1,104 @@
+"""
+Convert notebooks to Quarto markdown (.qmd) in-process.
+
+Produces the same text as `quarto convert notebook.ipynb` for the notebooks
+of this course, without starting the Quarto CLI:
+- a level 1 heading at the start of the first markdown cell becomes the
+  title in the YAML front matter, followed by `jupyter: <kernel name>`
+- markdown and raw cells are copied as they are, one blank line apart
+- code cells become ```{python} chunks; their cell metadata (tags,
+  slideshow, ...) becomes `#|` options after the options already in the code
+
+    qmd_text = notebook_to_qmd(read_notebook("lecture.ipynb"))
+"""
+import re
+
+# Plain YAML scalars may not start with these characters
+YAML_INDICATORS = "-?:,[]{}#&*!|>'\"%@`"
+YAML_RESERVED = re.compile(r"^(true|false|yes|no|on|off|null|~|[-+]?(\d[\d_]*)?\.?\d+([eE][-+]?\d+)?)$", re.IGNORECASE)
+
+TITLE = re.compile(r"#[ \t]+(.+?)[ \t]*(\n|$)")
+
+
+def notebook_to_qmd(notebook):
+    """Quarto markdown text of a notebook (a dict as read by notebook_transforms.read_notebook)."""
+    cells = notebook.get("cells", [])
+    language = notebook.get("metadata", {}).get("kernelspec", {}).get("language", "python")
+    front_matter = []
+    title = None
+    parts = []
+
+    for index, cell in enumerate(cells):
+        source = _text(cell.get("source", ""))
+        cell_type = cell.get("cell_type")
+
+        if index == 0 and cell_type == "raw" and source.startswith("---"):
+            # Front matter written in a raw cell
+            front_matter = source.strip().strip("-").strip("\n").splitlines()
+            continue
+
+        if cell_type == "code":
+            parts.append(_code_chunk(language, source, cell.get("metadata", {})))
+            continue
+
+        if title is None and not parts and cell_type == "markdown":
+            match = TITLE.match(source)
+            if match:
+                title = match.group(1)
+                parts.append(_ensure_newline(source[match.end():]) + "\n\n")
+                continue
+        parts.append(_ensure_newline(source) + "\n")
+
+    if title is not None and not any(line.startswith("title:") for line in front_matter):
+        front_matter.insert(0, f"title: {_yaml_scalar(title)}")
+    kernel = notebook.get("metadata", {}).get("kernelspec", {}).get("name")
+    if kernel and not any(line.startswith("jupyter:") for line in front_matter):
+        front_matter.append(f"jupyter: {kernel}")
+
+    return "---\n" + "".join(line + "\n" for line in front_matter) + "---\n\n" + "".join(parts)
+
+
+def _code_chunk(language, source, metadata):
+    """A ```{language} chunk: the code's own #| options, then the cell metadata as options, then the code."""
+    if not source:
+        return "\n"
+    lines = source.splitlines(True)
+    n_options = 0
+    while n_options < len(lines) and lines[n_options].startswith("#|"):
+        n_options += 1
+
+    chunk = ["```{" + language + "}\n", _ensure_newline("".join(lines[:n_options]))]
+    chunk += [f"#| {key}: {_yaml_flow(value)}\n" for key, value in metadata.items()]
+    chunk += [_ensure_newline("".join(lines[n_options:])), "```\n\n"]
+    return "".join(chunk)
+
+
+def _text(source):
+    return source if isinstance(source, str) else "".join(source)
+
+
+def _ensure_newline(text):
+    return text if not text or text.endswith("\n") else text + "\n"
+
+
+def _yaml_scalar(value):
+    """A string as a YAML scalar, single-quoted when it cannot be written plainly."""
+    plain = (value and value[0] not in YAML_INDICATORS and value == value.strip()
+             and ": " not in value and " #" not in value and not value.endswith(":")
+             and not YAML_RESERVED.match(value) and "\n" not in value)
+    return value if plain else "'" + value.replace("'", "''") + "'"
+
+
+def _yaml_flow(value):
+    """A metadata value in YAML flow style, e.g. [sol] or {slide_type: fragment}."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, list):
+        return "[" + ", ".join(_yaml_flow(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_yaml_scalar(str(k))}: {_yaml_flow(v)}" for k, v in value.items()) + "}"
+    return _yaml_scalar(str(value))
@@ -0,0 +1,265 @@
+"""
+Lightweight notebook transforms working on the raw notebook JSON.
+
+Notebooks are read with json.load into plain dicts (no NotebookNode
+conversion, no schema validation unless asked for), every cell is streamed
+once through a chain of transforms, and the result is written once in the
+same format as nbformat.write:
+
+    transform_file("exercises_solutions.ipynb", "exercises.ipynb",
+                   strip_tagged("sol"), clear_outputs())
+
+A transform is a function that takes a cell and returns a cell, None (to
+drop it) or a list of cells (to split it). Transforms should not modify the
+cells they are given in place, but return changed copies.
+
+nbformat is only needed for validate=True. Run this file to compare the
+speed of these transforms with nbformat on some notebooks:
+
+    python notebook_transforms.py 10/lecture_multidimensionalArrays.ipynb 15/*.ipynb
+"""
+import argparse
+import copy
+import json
+import time
+from pathlib import Path
+
+# Entries nbformat.write drops from the notebook metadata and from the cell metadata
+TRANSIENT_METADATA = ("orig_nbformat", "orig_nbformat_minor", "signature")
+TRANSIENT_CELL_METADATA = ("trusted",)
+
+
+def read_notebook(path):
+    """Read a notebook as a plain dict (only nbformat 4 notebooks are supported)."""
+    with open(path, encoding="utf-8") as f:
+        notebook = json.load(f)
+    if notebook.get("nbformat") != 4:
+        raise ValueError(f"{path} is not an nbformat 4 notebook, upgrade it with nbformat first")
+    return notebook
+
+
+def dumps_notebook(notebook, nbformat_style=True):
+    """
+    Serialize a notebook to JSON text.
+
+    With nbformat_style (the default) the text is what nbformat.write would
+    produce: sorted keys, one-space indent, multiline strings split into lines
+    and transient metadata dropped. Otherwise the keys keep their order.
+    """
+    if nbformat_style:
+        notebook = _split_lines(notebook)
+    return json.dumps(notebook, indent=1, sort_keys=nbformat_style, separators=(",", ": "), ensure_ascii=False) + "\n"
+
+
+def write_notebook(notebook, path, nbformat_style=True, validate=False):
+    """Write a notebook (see dumps_notebook), optionally validating it with nbformat first."""
+    if validate:
+        validate_notebook(notebook)
+    text = dumps_notebook(notebook, nbformat_style)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def validate_notebook(notebook):
+    """Validate a notebook against the nbformat schema (raises nbformat.ValidationError)."""
+    import nbformat
+
+    nbformat.validate(copy.deepcopy(notebook))
+
+
+def apply_transforms(cells, *transforms):
+    """Stream cells through a chain of transforms (a generator of the resulting cells)."""
+    for cell in cells:
+        pending = [cell]
+        for transform in transforms:
+            result = []
+            for c in pending:
+                out = transform(c)
+                if out is None:
+                    continue
+                if isinstance(out, dict):
+                    result.append(out)
+                else:
+                    result.extend(out)
+            pending = result
+            if not pending:
+                break
+        yield from pending
+
+
+def transform_notebook(notebook, *transforms):
+    """Apply transforms to the cells of a notebook, returning a new notebook dict."""
+    transformed = dict(notebook)
+    transformed["cells"] = list(apply_transforms(notebook.get("cells", []), *transforms))
+    return transformed
+
+
+def transform_file(path, output, *transforms, nbformat_style=True, validate=False):
+    """Read a notebook, apply transforms to its cells and write it to output; returns the result."""
+    notebook = transform_notebook(read_notebook(path), *transforms)
+    write_notebook(notebook, output, nbformat_style, validate)
+    return notebook
+
+
+def has_tag(cell, tag):
+    """Whether a cell has a tag in its metadata."""
+    return tag in cell.get("metadata", {}).get("tags", ())
+
+
+def drop_cells(predicate):
+    """Transform dropping the cells for which predicate(cell) is true."""
+    def transform(cell):
+        return None if predicate(cell) else cell
+    return transform
+
+
+def drop_tagged(tag):
+    """Transform dropping the cells with a tag."""
+    return drop_cells(lambda cell: has_tag(cell, tag))
+
+
+def untag(*tags):
+    """Transform removing tags from the cells (and the tags entry once it is empty)."""
+    def transform(cell):
+        metadata = cell.get("metadata", {})
+        if not any(tag in metadata.get("tags", ()) for tag in tags):
+            return cell
+        metadata = dict(metadata, tags=[t for t in metadata["tags"] if t not in tags])
+        if not metadata["tags"]:
+            del metadata["tags"]
+        return dict(cell, metadata=metadata)
+    return transform
+
+
+def strip_tagged(tag="sol", code_placeholder=""):
+    """
+    Transform blanking the source (and outputs) of the cells with a tag.
+    Code cells get code_placeholder as their source, e.g. "# Your code here".
+    """
+    def transform(cell):
+        if not has_tag(cell, tag):
+            return cell
+        cell = dict(cell, source=[])
+        if cell.get("cell_type") == "code":
+            cell["source"] = code_placeholder.splitlines(True)
+            cell["outputs"] = []
+            cell["execution_count"] = None
+        return cell
+    return transform
+
+
+def clear_outputs():
+    """Transform removing the outputs and execution counts of code cells."""
+    def transform(cell):
+        if cell.get("cell_type") != "code" or (not cell.get("outputs") and cell.get("execution_count") is None):
+            return cell
+        return dict(cell, outputs=[], execution_count=None)
+    return transform
+
+
+def retag_slides(header="## "):
+    """
+    Transform splitting markdown cells before every line starting with
+    `header` and tagging the pieces that start with it as slides.
+    """
+    def transform(cell):
+        if cell.get("cell_type") != "markdown":
+            return cell
+        source = cell.get("source", [])
+        if isinstance(source, str):
+            source = source.split("\n")
+
+        chunks = []
+        for line in source:
+            if line.strip().startswith(header) or not chunks:
+                chunks.append([])
+            chunks[-1].append(line)
+
+        cells = []
+        for chunk in chunks:
+            metadata = copy.deepcopy(cell.get("metadata", {}))
+            if chunk[0].strip().startswith(header):
+                metadata.setdefault("slideshow", {})["slide_type"] = "slide"
+            cells.append({"cell_type": "markdown", "metadata": metadata, "source": chunk})
+        return cells
+    return transform
+
+
+def _split_lines(notebook):
+    """Copy of the notebook with multiline strings split into lines, as nbformat writes them."""
+    notebook = dict(notebook)
+    metadata = notebook.get("metadata", {})
+    if any(key in metadata for key in TRANSIENT_METADATA):
+        notebook["metadata"] = {k: v for k, v in metadata.items() if k not in TRANSIENT_METADATA}
+
+    cells = []
+    for cell in notebook.get("cells", []):
+        cell = dict(cell)
+        if isinstance(cell.get("source"), str):
+            cell["source"] = cell["source"].splitlines(True)
+        if any(key in cell.get("metadata", {}) for key in TRANSIENT_CELL_METADATA):
+            cell["metadata"] = {k: v for k, v in cell["metadata"].items() if k not in TRANSIENT_CELL_METADATA}
+        if "attachments" in cell:
+            cell["attachments"] = {name: _split_mimebundle(bundle) for name, bundle in cell["attachments"].items()}
+        if cell.get("cell_type") == "code":
+            outputs = []
+            for output in cell.get("outputs", []):
+                if output.get("output_type") in ("execute_result", "display_data") and "data" in output:
+                    output = dict(output, data=_split_mimebundle(output["data"]))
+                elif output.get("output_type") == "stream" and isinstance(output.get("text"), str):
+                    output = dict(output, text=output["text"].splitlines(True))
+                outputs.append(output)
+            cell["outputs"] = outputs
+        cells.append(cell)
+    notebook["cells"] = cells
+    return notebook
+
+
+def _split_mimebundle(bundle):
+    """Split the text entries of a mimebundle into lines (not JSON or base64 image data), like nbformat."""
+    split = {}
+    for mime, value in bundle.items():
+        if isinstance(value, str) and (mime.startswith("text/") or mime in ("image/svg+xml", "application/javascript")):
+            value = value.splitlines(True)
+        split[mime] = value
+    return split
+
+
+def benchmark(paths, tag="sol", repeat=3):
+    """Time stripping `tag` cells and clearing outputs with these transforms and with nbformat."""
+    import nbformat
+
+    print(f"{'notebook':50s} {'size':>8s} {'nbformat':>10s} {'raw JSON':>10s} {'speed-up':>9s}  same output")
+    for path in paths:
+        path = Path(path)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            nb = nbformat.read(path, as_version=4)
+            for cell in nb.cells:
+                if "tags" in cell.metadata and tag in cell.metadata["tags"]:
+                    cell.source = ""
+                    if cell.cell_type == "code":
+                        cell.outputs = []
+                        cell.execution_count = None
+                if cell.cell_type == "code":
+                    cell.outputs = []
+                    cell.execution_count = None
+            expected = nbformat.writes(nb) + "\n"
+        nbformat_time = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            text = dumps_notebook(transform_notebook(read_notebook(path), strip_tagged(tag), clear_outputs()))
+        raw_time = (time.perf_counter() - start) / repeat
+
+        print(f"{str(path):50s} {path.stat().st_size / 1e6:6.2f}MB {nbformat_time * 1000:8.1f}ms "
+              f"{raw_time * 1000:8.1f}ms {nbformat_time / raw_time:8.1f}x  {'yes' if text == expected else 'no'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the raw JSON notebook transforms against nbformat.")
+    parser.add_argument("paths", nargs="+", help="Notebooks to benchmark on.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per notebook (default: 3).")
+    args = parser.parse_args()
+    benchmark(args.paths, repeat=args.repeat)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Turn the {python} chunks of QMD files into {pyodide} chunks with a caption
+showing the keyboard shortcuts, in one pass per file.
+
+Does what replace_python_with_pyodide.sh did with three perl passes over
+every file:
+- replaces {python} with {pyodide}
+- adds the caption line after every {pyodide} that does not already have it
+- collapses repeated caption lines (and anything after the caption on its line)
+
+Each file is read once and only written if its content changed, so files
+that are already rewritten keep their modification time (and Quarto's freeze
+cache stays valid). Files are written by replacing them, never in place, so
+hard links into sync_quarto.py's asset store are left alone.
+
+    python replace_python_with_pyodide.py            # every .qmd below the current directory
+    python replace_python_with_pyodide.py 07 slides/07_intro_numpy_slides.qmd
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+CAPTION = '#| caption: "▶ Ctrl/Cmd+Enter | ⇥ Ctrl/Cmd+] | ⇤ Ctrl/Cmd+["'
+
+# {pyodide} not already followed by a caption line
+MISSING_CAPTION = re.compile(r'(\{pyodide\})(?!\n#\| caption)')
+# The caption, then anything up to the first line break not followed by another
+# caption line (perl's \Z, which also matches before a final newline)
+REPEATED_CAPTION = re.compile('(' + re.escape(CAPTION) + r')[\s\S]*?(?=\n(?!#\| caption)|\n?\Z)')
+
+
+def rewrite(text: str) -> str:
+    """The text of a QMD file with its python chunks turned into captioned pyodide chunks."""
+    text = text.replace('{python}', '{pyodide}')
+    text = MISSING_CAPTION.sub(lambda m: m.group(1) + '\n' + CAPTION, text)
+    return REPEATED_CAPTION.sub(lambda m: m.group(1), text)
+
+
+def rewrite_file(path: Path, dry_run: bool = False) -> bool:
+    """Rewrite one file if it needs it; returns whether it changed."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    new_text = rewrite(text)
+    if new_text == text:
+        return False
+    if not dry_run:
+        mode = path.stat().st_mode
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(new_text)
+            os.chmod(tmp, mode | 0o200)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    return True
+
+
+def find_qmd_files(inputs) -> list:
+    """QMD files given directly, and all QMD files below the given directories (not in hidden ones or _site)."""
+    files = set()
+    for item in map(Path, inputs):
+        if item.is_dir():
+            files.update(p for p in item.rglob('*.qmd')
+                         if not any(part.startswith('.') or part == '_site' for part in p.relative_to(item).parts[:-1]))
+        else:
+            files.add(item)
+    return sorted(files)
+
+
+def _rewrite(task):
+    path, dry_run = task
+    try:
+        return path, rewrite_file(path, dry_run), None
+    except Exception as e:
+        return path, False, f'{type(e).__name__}: {e}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Turn {python} chunks of QMD files into captioned {pyodide} chunks.')
+    parser.add_argument('paths', nargs='*', default=['.'],
+                        help='QMD files and/or directories to search for them (default: the current directory).')
+    parser.add_argument('-j', '--jobs', type=int, help='Number of parallel workers (default: one per CPU).')
+    parser.add_argument('-n', '--dry-run', action='store_true', help='Only list the files that would change.')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    files = find_qmd_files(args.paths)
+    tasks = [(path, args.dry_run) for path in files]
+    changed = failures = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for path, was_changed, error in pool.map(_rewrite, tasks, chunksize=8):
+            if error:
+                failures += 1
+                print(f"✗ {path}: {error}", file=sys.stderr)
+            elif was_changed:
+                changed += 1
+                print(f"{'Would rewrite' if args.dry_run else '✓ Rewrote'} {path}")
+    print(f"{len(files)} files, {changed} {'to rewrite' if args.dry_run else 'rewritten'} "
+          f"in {time.perf_counter() - start:.2f}s" + (f", {failures} failed" if failures else ""))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
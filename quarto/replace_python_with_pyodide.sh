@@ -1,16 +1,8 @@
-find . -type f -name "*.qmd" -exec perl -i -pe '
-  if (/{python}/) {
-    s/{python}/{pyodide}/g;
-  }
-' {} +
+#!/bin/bash
 
-find . -type f -name "*.qmd" -exec perl -i -0777 -pe '
-  s/(\{pyodide\})(?!\n#\| caption)/$1\n#| caption: "▶ Ctrl\/Cmd+Enter | ⇥ Ctrl\/Cmd+] | ⇤ Ctrl\/Cmd+\["/g;
-' {} +
+# Turn {python} chunks into {pyodide} chunks with a caption in every .qmd below
+# the current directory: see replace_python_with_pyodide.py, which does it in
+# one pass per file and only rewrites the files that change.
+# Usage: ./replace_python_with_pyodide.sh [files or directories]
 
-
-# turn this on to collapse to one line if there is a mistake
-
-find . -type f -name "*.qmd" -exec perl -i -0777 -pe '
-  s/(#\| caption: "▶ Ctrl\/Cmd\+Enter \| ⇥ Ctrl\/Cmd\+\] \| ⇤ Ctrl\/Cmd\+\[")[\s\S]*?(?=\n(?!#\| caption)|\Z)/$1/mg;
-' {} +
\ No newline at end of file
+exec python3 "$(dirname "$0")/replace_python_with_pyodide.py" "$@"
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Wait for files to change in a set of directories.
+
+Uses Linux inotify (through ctypes, no extra package) when it is available
+and falls back to polling modification times and sizes otherwise:
+
+    watcher = make_watcher([Path('.')], suffix='.qmd')
+    changed = watcher.wait()            # blocks until something changes
+    more = watcher.wait(timeout=0.3)    # empty set if nothing changed meanwhile
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# inotify event masks (from <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = os.O_NONBLOCK
+
+# Editors save either in place or by writing a temporary file and renaming it
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Watch directories with inotify (Linux only)."""
+
+    def __init__(self, directories, suffix=''):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.suffix = suffix
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.directories = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f'cannot watch {directory}')
+            self.directories[wd] = Path(directory)
+
+    def wait(self, timeout=None) -> set:
+        """Paths that changed, waiting up to `timeout` seconds (forever if None) for the first one."""
+        changed = set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not changed:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                break
+            changed |= self._read_events()
+        return changed
+
+    def _read_events(self) -> set:
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if name.endswith(self.suffix) and wd in self.directories:
+                changed.add(self.directories[wd] / name)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Watch directories by comparing modification times and sizes every `interval` seconds."""
+
+    def __init__(self, directories, suffix='', interval=0.5):
+        self.directories = [Path(d) for d in directories]
+        self.suffix = suffix
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self) -> dict:
+        state = {}
+        for directory in self.directories:
+            for path in directory.glob(f'*{self.suffix}'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def wait(self, timeout=None) -> set:
+        """Paths that changed, waiting up to `timeout` seconds (forever if None) for the first one."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self._scan()
+            changed = {p for p in state.keys() | self.state.keys() if state.get(p) != self.state.get(p)}
+            self.state = state
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0)))
+
+    def close(self):
+        pass
+
+
+def make_watcher(directories, suffix='', poll=False):
+    """An InotifyWatcher if inotify works here (and poll is False), a PollingWatcher otherwise."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directories, suffix)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(directories, suffix)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Pure-Python QMD to Jupyter notebook parser.
+
+Produces the same notebook structure as `quarto convert file.qmd`, without
+starting the Quarto CLI:
+- YAML front matter (including the --- lines) starts the first markdown cell
+- fenced {python} / {pyodide} chunks become code cells; their `#|` option
+  lines are kept at the top of the cell, as Quarto does
+- everything in between (text, ::: divs, non-executable code blocks) becomes
+  markdown cells, without their leading blank lines and the blank line
+  before each chunk
+
+Constructs this parser does not handle (chunks of other engines, chunk
+options written inside the braces, indented chunks) raise UnsupportedQmd so
+that the caller can fall back to the Quarto CLI.
+
+Run as a script to benchmark it against `quarto convert`:
+    python qmd_parser.py --benchmark *.qmd
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Languages whose chunks become code cells
+CODE_LANGUAGES = ('python', 'pyodide')
+
+# Chunks that Quarto runs with another engine (or turns into something else)
+OTHER_ENGINES = ('r', 'julia', 'ojs', 'bash', 'sql', 'mermaid', 'dot')
+
+FENCE = re.compile(r'^(?P<indent>[ \t]*)(?P<fence>`{3,}|~{3,})\s*(?P<info>.*?)\s*$')
+CHUNK_INFO = re.compile(r'^\{\s*(?P<language>[A-Za-z0-9_.-]+)(?P<attributes>[^}]*)\}$')
+
+NOTEBOOK_METADATA = {
+    'kernelspec': {'display_name': 'Python 3', 'language': 'python', 'name': 'python3'}
+}
+
+
+class UnsupportedQmd(ValueError):
+    """The QMD file uses a construct that only the Quarto CLI converts correctly."""
+
+
+def parse_qmd(qmd_content: str) -> dict:
+    """Parse QMD text into an nbformat 4 notebook (as a plain dict)."""
+    lines = qmd_content.splitlines(keepends=True)
+    cells = []
+    markdown = []
+    position = 0
+
+    # YAML front matter is markdown too (it starts the first markdown cell),
+    # but nothing in it is a code fence
+    if lines and lines[0].rstrip() == '---':
+        for end in range(1, len(lines)):
+            if lines[end].rstrip() in ('---', '...'):
+                markdown.extend(lines[:end + 1])
+                position = end + 1
+                break
+
+    while position < len(lines):
+        line = lines[position]
+        match = FENCE.match(line)
+        if not match:
+            markdown.append(line)
+            position += 1
+            continue
+
+        end = _closing_fence(lines, position, match)
+        chunk = CHUNK_INFO.match(match.group('info'))
+        language = chunk.group('language').lower() if chunk else None
+
+        if language in CODE_LANGUAGES:
+            if match.group('indent'):
+                raise UnsupportedQmd(f"Indented {{{language}}} chunk on line {position + 1}")
+            if chunk.group('attributes').strip():
+                raise UnsupportedQmd(f"Chunk options inside the braces on line {position + 1}")
+            if end is None:
+                raise UnsupportedQmd(f"Unclosed {{{language}}} chunk on line {position + 1}")
+            _flush_markdown(cells, markdown)
+            cells.append(_cell('code', lines[position + 1:end]))
+        elif chunk and language in OTHER_ENGINES:
+            raise UnsupportedQmd(f"{{{language}}} chunk on line {position + 1}")
+        else:
+            # A non-executable code block is part of the markdown, as is
+            # anything inside it that looks like a chunk
+            markdown.extend(lines[position:len(lines) if end is None else end + 1])
+        position = len(lines) if end is None else end + 1
+
+    _flush_markdown(cells, markdown)
+    return {
+        'cells': cells,
+        'metadata': json.loads(json.dumps(NOTEBOOK_METADATA)),
+        'nbformat': 4,
+        'nbformat_minor': 4,
+    }
+
+
+def _closing_fence(lines, start, opening):
+    """Index of the line closing the fence opened on line `start` (None if unclosed)."""
+    fence = opening.group('fence')
+    for index in range(start + 1, len(lines)):
+        match = FENCE.match(lines[index])
+        if (match and not match.group('info') and match.group('fence')[0] == fence[0]
+                and len(match.group('fence')) >= len(fence)):
+            return index
+    return None
+
+
+def _flush_markdown(cells, markdown):
+    """
+    Turn the collected markdown lines into a cell and reset them.
+
+    Like Quarto, leading blank lines are dropped but only one trailing blank
+    line (the one before the chunk or at the end of the file).
+    """
+    while markdown and not markdown[0].strip():
+        markdown.pop(0)
+    if markdown and not markdown[-1].strip():
+        markdown.pop()
+    if markdown:
+        cells.append(_cell('markdown', markdown))
+    markdown.clear()
+
+
+def _cell(cell_type, lines):
+    """Build a cell whose source is `lines`, without the newline at the very end."""
+    text = ''.join(lines)
+    if text.endswith('\n'):
+        text = text[:-1]
+    source = text.splitlines(keepends=True)
+    if cell_type == 'markdown':
+        return {'cell_type': 'markdown', 'metadata': {}, 'source': source}
+    return {'cell_type': 'code', 'metadata': {}, 'source': source, 'execution_count': None, 'outputs': []}
+
+
+def quarto_convert(qmd_content: str) -> dict:
+    """Convert QMD text with the Quarto CLI (raises on failure)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        qmd_path = Path(tmp) / 'input.qmd'
+        ipynb_path = qmd_path.with_suffix('.ipynb')
+        qmd_path.write_text(qmd_content, encoding='utf-8')
+        subprocess.run(
+            ['quarto', 'convert', str(qmd_path), '--output', str(ipynb_path)],
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        with open(ipynb_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def benchmark(paths, repeat=5) -> None:
+    """Time parse_qmd against `quarto convert` on each file and check the results agree."""
+    print(f"{'file':40s} {'native':>10s} {'quarto':>10s} {'speed-up':>9s}  same cells")
+    for path in paths:
+        qmd_content = Path(path).read_text(encoding='utf-8')
+
+        start = time.perf_counter()
+        try:
+            for _ in range(repeat):
+                native = parse_qmd(qmd_content)
+        except UnsupportedQmd as e:
+            print(f"{Path(path).name:40s} unsupported: {e}")
+            continue
+        native_time = (time.perf_counter() - start) / repeat
+
+        try:
+            start = time.perf_counter()
+            reference = quarto_convert(qmd_content)
+            quarto_time = time.perf_counter() - start
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            print(f"{Path(path).name:40s} {native_time * 1000:8.2f}ms {'n/a':>10s}")
+            continue
+
+        same = [c['cell_type'] for c in native['cells']] == [c['cell_type'] for c in reference['cells']] and all(
+            ''.join(a['source']) == ''.join(b['source']) for a, b in zip(native['cells'], reference['cells']))
+        print(f"{Path(path).name:40s} {native_time * 1000:8.2f}ms {quarto_time * 1000:8.2f}ms "
+              f"{quarto_time / native_time:8.0f}x  {'yes' if same else 'NO'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse QMD files into notebooks without Quarto')
+    parser.add_argument('inputs', nargs='+', type=Path, help='Input QMD files')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare speed and output with `quarto convert` instead of writing notebooks')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.inputs)
+        return
+
+    for path in args.inputs:
+        try:
+            notebook = parse_qmd(path.read_text(encoding='utf-8'))
+        except UnsupportedQmd as e:
+            print(f"Error: {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        with open(path.with_suffix('.ipynb'), 'w', encoding='utf-8') as f:
+            json.dump(notebook, f, indent=1, ensure_ascii=False)
+            f.write('\n')
+        print(f"✓ Created {path.with_suffix('.ipynb')}")
+
+
+if __name__ == '__main__':
+    main()
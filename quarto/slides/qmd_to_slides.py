@@ -1,19 +1,50 @@
 #!/usr/bin/env python3
 """
 Convert QMD files to Jupyter notebooks with slide metadata.
+- Parses the QMD with qmd_parser (falls back to `quarto convert` for
+  constructs it does not support, see --engine)
 - Replaces {pyodide} cells with {python}
 - Removes ::: div blocks
 - Tags cells with ## headers as Slide cells
+
+Given a directory, a glob or several files, converts them in batch: decks
+whose content (and this converter) have not changed since the last run are
+skipped using a manifest of hashes, the others are converted in parallel.
+With --watch, keeps running and reconverts decks as they are saved.
 """
 
 import argparse
+import contextlib
+import hashlib
+import io
 import json
 import re
 import subprocess
 import sys
 import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+from file_watch import make_watcher
+from qmd_parser import UnsupportedQmd, parse_qmd
+
+# notebook_transforms lives at the root of the repository
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from notebook_transforms import dumps_notebook, retag_slides, transform_notebook  # noqa: E402
+
+ENGINES = ('auto', 'native', 'quarto')
+
+# Batch mode remembers what it converted here, in each slides directory
+MANIFEST_NAME = '.qmd_to_slides_manifest.json'
+
+# Hash of the converter itself: changing it reconverts every deck
+CONVERTER_VERSION = hashlib.sha256(b''.join(
+    path.read_bytes() for path in (Path(__file__), Path(__file__).parent / 'qmd_parser.py',
+                                   Path(__file__).resolve().parents[2] / 'notebook_transforms.py')
+)).hexdigest()[:16]
+
 
 def preprocess_qmd(qmd_content: str) -> str:
     """Preprocess QMD content before conversion."""
@@ -23,19 +54,18 @@ def preprocess_qmd(qmd_content: str) -> str:
     return content
 
 
-def convert_qmd_to_ipynb(qmd_path: Path) -> Path:
-    """Use Quarto to convert QMD to IPYNB format."""
+def convert_qmd_to_ipynb(qmd_path: Path) -> dict:
+    """Use Quarto to convert QMD to IPYNB format and return the parsed notebook."""
     output_path = qmd_path.with_suffix('.ipynb')
-    
+
     try:
         # Use quarto convert for proper QMD handling
         subprocess.run(
-            ['quarto', 'convert', str(qmd_path)],
+            ['quarto', 'convert', str(qmd_path), '--output', str(output_path)],
             check=True,
             capture_output=True,
             text=True
         )
-        return output_path
     except subprocess.CalledProcessError as e:
         print(f"Error converting with Quarto: {e.stderr}", file=sys.stderr)
         sys.exit(1)
@@ -43,12 +73,16 @@ def convert_qmd_to_ipynb(qmd_path: Path) -> Path:
         print("Error: 'quarto' command not found. Please install Quarto.", file=sys.stderr)
         sys.exit(1)
 
+    # The only time the notebook JSON is parsed: everything after this works in memory
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        output_path.unlink(missing_ok=True)
+
 
-def clean_notebook(ipynb_path: Path, title=None) -> None:
+def clean_notebook(notebook: dict, title=None) -> dict:
     """Clean up the notebook by removing YAML frontmatter and ::: directives."""
-    with open(ipynb_path, 'r', encoding='utf-8') as f:
-        notebook = json.load(f)
-
     cleaned_cells = []
     # Insert title slide if found
     if title:
@@ -99,140 +133,335 @@ def clean_notebook(ipynb_path: Path, title=None) -> None:
             cleaned_cells.append(cell)
     
     notebook['cells'] = cleaned_cells
-    
-    # Write back
-    with open(ipynb_path, 'w', encoding='utf-8') as f:
-        json.dump(notebook, f, indent=1, ensure_ascii=False)
-        f.write('\n')
+    return notebook
 
 
-def split_and_tag_slides(ipynb_path: Path) -> None:
+def split_and_tag_slides(notebook: dict) -> dict:
     """Split markdown cells at ## headers and tag them as slides."""
-    with open(ipynb_path, 'r', encoding='utf-8') as f:
-        notebook = json.load(f)
-    
-    new_cells = []
+    return transform_notebook(notebook, retag_slides('## '))
+
+
+def write_notebook(notebook: dict, ipynb_path: Path) -> None:
+    """Write the notebook JSON to disk (keys in the order they were created)."""
+    with open(ipynb_path, 'w', encoding='utf-8') as f:
+        f.write(dumps_notebook(notebook, nbformat_style=False))
+
+
+def extract_title(qmd_content: str):
+    """Extract the title from the YAML frontmatter, if there is one."""
+    yaml_match = re.search(r'^---(.*?)---', qmd_content, re.DOTALL | re.MULTILINE)
+    if yaml_match:
+        yaml_block = yaml_match.group(1)
+        title_match = re.search(r'title:\s*([^\n]+)', yaml_block)
+        if title_match:
+            return title_match.group(1).strip('`\"')
+    return None
+
+
+def qmd_to_notebook(qmd_content: str, engine: str = 'auto') -> dict:
+    """
+    Turn preprocessed QMD text into a notebook.
+
+    engine 'native' only uses qmd_parser, 'quarto' only the Quarto CLI and
+    'auto' uses qmd_parser unless the file has a construct it does not support.
+    """
+    if engine != 'quarto':
+        try:
+            print("Converting to IPYNB with qmd_parser...")
+            return parse_qmd(qmd_content)
+        except UnsupportedQmd as e:
+            if engine == 'native':
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"qmd_parser cannot convert this file ({e}), falling back to Quarto")
+
+    # Write to temporary file
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.qmd', delete=False, encoding='utf-8') as f:
+        f.write(qmd_content)
+        temp_qmd = Path(f.name)
+
+    try:
+        # Convert to IPYNB using Quarto
+        print("Converting to IPYNB with Quarto...")
+        return convert_qmd_to_ipynb(temp_qmd)
+    finally:
+        # Clean up temp file
+        temp_qmd.unlink(missing_ok=True)
+
+
+def convert_file(input_qmd: Path, output: Path = None, engine: str = 'auto') -> Path:
+    """
+    Convert one QMD file to a slide notebook.
+
+    The notebook (from qmd_parser or Quarto, see qmd_to_notebook) is cleaned
+    and split into slides in memory, and written once to the output path
+    (default: the input path with an .ipynb extension).
+    """
+    start = time.perf_counter()
+    output = output or input_qmd.with_suffix('.ipynb')
+
+    # Read and process QMD content
+    print(f"Reading {input_qmd}...")
+    with open(input_qmd, 'r', encoding='utf-8') as f:
+        qmd_content = f.read()
+    # Extract title from YAML frontmatter
+    title = extract_title(qmd_content)
+    print("THE TITLE IS:", title)
     
-    for cell in notebook.get('cells', []):
-        if cell.get('cell_type') == 'markdown':
-            source = cell.get('source', [])
-            if isinstance(source, str):
-                source = source.split('\n')
-            # Split at ## headers, always preserve all lines
-            current_chunk = []
-            for line in source:
-                if line.strip().startswith('## '):
-                    # Save previous chunk if it exists
-                    if current_chunk:
-                        new_cell = {
-                            'cell_type': 'markdown',
-                            'metadata': cell.get('metadata', {}).copy(),
-                            'source': current_chunk
-                        }
-                        # Tag as slide if starts with ##
-                        if current_chunk[0].strip().startswith('## '):
-                            if 'slideshow' not in new_cell['metadata']:
-                                new_cell['metadata']['slideshow'] = {}
-                            new_cell['metadata']['slideshow']['slide_type'] = 'slide'
-                        new_cells.append(new_cell)
-                    current_chunk = [line]
-                else:
-                    current_chunk.append(line)
-            # Save final chunk
-            if current_chunk:
-                new_cell = {
-                    'cell_type': 'markdown',
-                    'metadata': cell.get('metadata', {}).copy(),
-                    'source': current_chunk
-                }
-                if current_chunk[0].strip().startswith('## '):
-                    if 'slideshow' not in new_cell['metadata']:
-                        new_cell['metadata']['slideshow'] = {}
-                    new_cell['metadata']['slideshow']['slide_type'] = 'slide'
-                new_cells.append(new_cell)
+    # Preprocess: replace pyodide cells
+    print("Preprocessing QMD (replacing {pyodide} with {python})...")
+    modified_content = preprocess_qmd(qmd_content)
+    notebook = qmd_to_notebook(modified_content, engine)
+    converted = time.perf_counter()
+
+    # Clean the notebook
+    print("Cleaning notebook (removing YAML frontmatter and ::: directives)...")
+    notebook = clean_notebook(notebook, title)
+
+    # Split at ## headers and tag as slides
+    print("Splitting at ## headers and tagging as slides...")
+    notebook = split_and_tag_slides(notebook)
+
+    write_notebook(notebook, output)
+    done = time.perf_counter()
+    print(f"✓ Successfully created {output} in {done - start:.2f}s "
+          f"(conversion {converted - start:.2f}s, cleanup/split/write {done - converted:.2f}s)")
+    return output
+
+
+def find_qmd_files(inputs) -> list:
+    """Expand directories (their *.qmd files) and glob patterns into a sorted list of QMD files."""
+    files = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            files.update(path.glob('*.qmd'))
+        elif path.exists():
+            files.add(path)
         else:
-            new_cells.append(cell)
-    
-    notebook['cells'] = new_cells
-    
-    # Write back to file
-    with open(ipynb_path, 'w', encoding='utf-8') as f:
-        json.dump(notebook, f, indent=1, ensure_ascii=False)
+            anchor = Path(path.anchor) if path.is_absolute() else Path('.')
+            files.update(anchor.glob(str(path.relative_to(anchor))))
+    return sorted(p for p in files if p.suffix == '.qmd')
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def read_manifest(directory: Path) -> dict:
+    """The batch manifest of a directory (empty if there is none or it is unreadable)."""
+    try:
+        with open(directory / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(directory: Path, manifest: dict) -> None:
+    """Write the batch manifest of a directory."""
+    with open(directory / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
         f.write('\n')
 
 
+def manifest_entry(input_qmd: Path, engine: str) -> dict:
+    """What the manifest records about a converted deck."""
+    return {'sha256': file_hash(input_qmd), 'converter': CONVERTER_VERSION, 'engine': engine}
+
+
+def _convert_quietly(task):
+    """
+    Convert one deck, returning (path, seconds, error, log) with its output
+    captured in log. Redirecting sys.stdout/stderr affects the whole process,
+    so this runs in a worker process, or in the main thread when there is no
+    other thread printing.
+    """
+    input_qmd, engine = task
+    log = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            convert_file(input_qmd, engine=engine)
+        except SystemExit:
+            error = 'conversion failed'
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+    return input_qmd, time.perf_counter() - start, error, log.getvalue()
+
+
+def convert_batch(files, engine: str = 'auto', jobs: int = None, force: bool = False,
+                  pool: ProcessPoolExecutor = None) -> bool:
+    """
+    Convert many decks, skipping the ones the manifest says are up to date.
+
+    A deck is up to date when its output exists and the manifest of its
+    directory records the same content hash, converter version and engine.
+    The others are converted on `pool` if given, otherwise on a new pool of
+    `jobs` processes (default: one per CPU). Returns True if every
+    conversion succeeded.
+    """
+    start = time.perf_counter()
+    manifests = {}
+    # Entries computed before converting: a deck edited during its conversion
+    # must not be recorded as up to date with its new content
+    entries = {}
+    todo = []
+    for input_qmd in files:
+        manifest = manifests.setdefault(input_qmd.parent, read_manifest(input_qmd.parent))
+        entries[input_qmd] = manifest_entry(input_qmd, engine)
+        up_to_date = (manifest.get(input_qmd.name) == entries[input_qmd]
+                      and input_qmd.with_suffix('.ipynb').exists())
+        if force or not up_to_date:
+            todo.append(input_qmd)
+    print(f"{len(files)} decks, {len(files) - len(todo)} up to date, converting {len(todo)}...")
+
+    tasks = [(input_qmd, engine) for input_qmd in todo]
+    new_pool = pool is None and jobs != 1 and len(tasks) > 1
+    failures = 0
+    with ProcessPoolExecutor(max_workers=jobs) if new_pool else contextlib.nullcontext(pool) as pool:
+        results = pool.map(_convert_quietly, tasks) if pool is not None else map(_convert_quietly, tasks)
+        for input_qmd, seconds, error, log in results:
+            if error:
+                failures += 1
+                print(f"✗ {input_qmd} ({seconds:.2f}s): {error}\n{log}", file=sys.stderr)
+                manifests[input_qmd.parent].pop(input_qmd.name, None)
+            else:
+                print(f"✓ {input_qmd} ({seconds:.2f}s)")
+                manifests[input_qmd.parent][input_qmd.name] = entries[input_qmd]
+
+    for directory, manifest in manifests.items():
+        write_manifest(directory, manifest)
+    print(f"Converted {len(todo) - failures} of {len(todo)} decks in {time.perf_counter() - start:.2f}s"
+          + (f", {failures} failed" if failures else ""))
+    return failures == 0
+
+
+def _report_exception(future) -> None:
+    """Done callback printing the exception a background conversion raised, if any."""
+    if not future.cancelled() and future.exception() is not None:
+        error = future.exception()
+        print('✗ Conversion failed:', ''.join(traceback.format_exception(type(error), error, error.__traceback__)),
+              file=sys.stderr)
+
+
+def watch(inputs, engine: str = 'auto', debounce: float = 0.3, poll: bool = False) -> None:
+    """
+    Convert the decks in `inputs`, then reconvert them whenever they are saved.
+
+    Changes are collected until none has arrived for `debounce` seconds (an
+    editor often writes a file several times per save) and the changed decks
+    are converted one batch at a time by a background thread, on a single
+    worker process kept for the whole session, so that each reconversion is
+    done with everything already imported and its output captured without
+    touching this process's sys.stdout.
+    Runs until interrupted with Ctrl+C.
+    """
+    files = find_qmd_files(inputs)
+    directories = sorted({p if p.is_dir() else p.parent for p in map(Path, inputs) if p.exists()} |
+                         {p.parent for p in files})
+    watcher = make_watcher(directories, suffix='.qmd', poll=poll)
+    print(f"Watching {', '.join(map(str, directories))} ({type(watcher).__name__}), press Ctrl+C to stop")
+
+    with ProcessPoolExecutor(max_workers=1) as worker, ThreadPoolExecutor(max_workers=1) as background:
+        background.submit(convert_batch, files, engine, 1, False, worker).add_done_callback(_report_exception)
+        try:
+            while True:
+                changed = watcher.wait()
+                while True:
+                    more = watcher.wait(debounce)
+                    if not more:
+                        break
+                    changed |= more
+                # Only decks still there and selected by the inputs (new files in a watched directory count)
+                selected = {p.resolve() for p in find_qmd_files(inputs)}
+                decks = sorted(p for p in changed if p.exists() and p.resolve() in selected)
+                if decks:
+                    background.submit(convert_batch, decks, engine, 1, False, worker).add_done_callback(
+                        _report_exception)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        finally:
+            watcher.close()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert QMD to IPYNB with slide metadata'
     )
     parser.add_argument(
-        'input_qmd',
-        type=Path,
-        help='Input QMD file path'
+        'inputs',
+        nargs='+',
+        help='Input QMD file path, or several files, directories or glob patterns to convert in batch'
     )
     parser.add_argument(
         '-o', '--output',
         type=Path,
         help='Output IPYNB file path (default: same name as input with .ipynb extension)'
     )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='auto',
+        help='QMD parser: native (qmd_parser), quarto (the Quarto CLI) or auto '
+             '(native, falling back to Quarto for unsupported constructs; default)'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        help='Number of decks converted in parallel in batch mode (default: one per CPU)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='In batch mode, convert every deck even if it has not changed'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and reconvert the decks whenever they change'
+    )
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=0.3,
+        help='With --watch, seconds without changes to wait before reconverting (default: 0.3)'
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='With --watch, poll for changes instead of using inotify'
+    )
     
     args = parser.parse_args()
-    
-    # Validate input file
-    if not args.input_qmd.exists():
-        print(f"Error: Input file '{args.input_qmd}' not found.", file=sys.stderr)
-        sys.exit(1)
-    
-    if args.input_qmd.suffix != '.qmd':
-        print("Warning: Input file does not have .qmd extension", file=sys.stderr)
-    
-    # Read and process QMD content
-    print(f"Reading {args.input_qmd}...")
-    with open(args.input_qmd, 'r', encoding='utf-8') as f:
-        qmd_content = f.read()
-    # Extract title from YAML frontmatter
-    title = None
-    yaml_match = re.search(r'^---(.*?)---', qmd_content, re.DOTALL | re.MULTILINE)
-    if yaml_match:
-        yaml_block = yaml_match.group(1)
-        title_match = re.search(r'title:\s*([^\n]+)', yaml_block)
-        if title_match:
-            title = title_match.group(1).strip('`\"')
-    print("THE TITLE IS:", title)
-    
-    # Preprocess: replace pyodide cells
-    print("Preprocessing QMD (replacing {pyodide} with {python})...")
-    modified_content = preprocess_qmd(qmd_content)
-    
-    # Write to temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.qmd', delete=False, encoding='utf-8') as f:
-        f.write(modified_content)
-        temp_qmd = Path(f.name)
-    
-    try:
-        # Convert to IPYNB using Quarto
-        print("Converting to IPYNB with Quarto...")
-        ipynb_path = convert_qmd_to_ipynb(temp_qmd)
-        
-        # Clean the notebook
-        print("Cleaning notebook (removing YAML frontmatter and ::: directives)...")
-        clean_notebook(ipynb_path, title)
-        
-        # Split at ## headers and tag as slides
-        print("Splitting at ## headers and tagging as slides...")
-        split_and_tag_slides(ipynb_path)
-        
-        # Move to output path if specified
-        final_path = ipynb_path
+
+    if args.watch:
         if args.output:
-            ipynb_path.rename(args.output)
-            final_path = args.output
-        
-        print(f"✓ Successfully created {final_path}")
-        
-    finally:
-        # Clean up temp file
-        temp_qmd.unlink(missing_ok=True)
+            print("Error: --output cannot be used with --watch.", file=sys.stderr)
+            sys.exit(1)
+        watch(args.inputs, args.engine, args.debounce, args.poll)
+        return
+
+    # One existing file: convert it, as before
+    single = Path(args.inputs[0])
+    if len(args.inputs) == 1 and single.is_file():
+        if single.suffix != '.qmd':
+            print("Warning: Input file does not have .qmd extension", file=sys.stderr)
+        convert_file(single, args.output, args.engine)
+        return
+
+    if args.output:
+        print("Error: --output only works with a single input file.", file=sys.stderr)
+        sys.exit(1)
+
+    files = find_qmd_files(args.inputs)
+    if not files:
+        print(f"Error: No QMD files found in {' '.join(args.inputs)}.", file=sys.stderr)
+        sys.exit(1)
+
+    if not convert_batch(files, args.engine, args.jobs, args.force):
+        sys.exit(1)
 
 
 if __name__ == '__main__':
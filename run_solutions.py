@@ -0,0 +1,242 @@
+import argparse
+import contextlib
+import hashlib
+import importlib.metadata
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from clear_solutions import NAME_RULE, SOLUTION_SUFFIXES
+from kernel_pool import KernelPool
+
+# Check that the solution notebooks (the notebooks in the numbered folders
+# whose names end in one of clear_solutions' SOLUTION_SUFFIXES, e.g.
+# exercises_*_solutions.ipynb or exercises_*-solution.ipynb, but not the
+# outputs of clear_solutions) still run: every notebook is
+# executed headless in its own kernel (with nbclient, from its folder, so that
+# relative data paths work), several at a time, and nothing is written back.
+#
+# For every cell the wall time and the kernel's running peak memory (VmHWM, on
+# Linux: the most it used up to the end of that cell, not the cell's own use)
+# are recorded. Results are cached in a JSON file keyed by a hash of the
+# notebook and of the environment (Python version, installed packages, kernel),
+# so a notebook is only run again when it or the environment changed.
+#
+# With --warm the notebooks run on kernels from a KernelPool (kernel_pool.py),
+# which have the common imports loaded already, instead of new kernels (their
+# peak memory is reset when they are given back, so it is the peak since the
+# notebook started). The time from starting a notebook to its first cell is
+# reported either way.
+ROOT = Path(__file__).resolve().parent
+CACHE_NAME = ".execution_cache.json"
+FOLDER = re.compile(r"\d+")
+EMPTY_SOLUTIONS = NAME_RULE.format(stem="", base="")
+
+
+def is_solution(path):
+    return path.stem.endswith(SOLUTION_SUFFIXES) and not path.stem.endswith(EMPTY_SOLUTIONS)
+
+
+def find_solutions(root=ROOT):
+    notebooks = []
+    for folder in root.iterdir():
+        if folder.is_dir() and FOLDER.fullmatch(folder.name):
+            notebooks.extend(p for p in folder.glob("*.ipynb") if is_solution(p))
+    return sorted(notebooks)
+
+
+# Hash of what, besides the notebook, decides whether it runs: the Python
+# version, the installed distributions and the kernel (assumed to run in this
+# environment, like the default ipykernel one)
+def environment_hash(kernel_name):
+    distributions = sorted(f"{d.metadata['Name']}=={d.version}" for d in importlib.metadata.distributions())
+    text = "\n".join([sys.version, kernel_name, *distributions])
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+# Name of a notebook in the cache and the report: its path relative to the
+# repository, or to the current directory for notebooks outside it
+def notebook_name(path):
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return Path(os.path.relpath(path)).as_posix()
+
+
+def notebook_key(path, environment):
+    return hashlib.sha256(Path(path).read_bytes() + environment.encode()).hexdigest()
+
+
+def read_cache(root=ROOT):
+    try:
+        with open(root / CACHE_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_cache(cache, root=ROOT):
+    with open(root / CACHE_NAME, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+# Peak resident memory of a process in MB (Linux only, None elsewhere)
+def peak_memory(pid):
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, TypeError):
+        pass
+    return None
+
+
+def _kernel_pid(kernel_manager):
+    provisioner = getattr(kernel_manager, "provisioner", None)
+    process = getattr(provisioner, "process", None) or getattr(kernel_manager, "kernel", None)
+    return getattr(process, "pid", None)
+
+
+# Execute one notebook; returns its result: status ("passed", "failed" when a
+# cell raised or timed out, "error" when it could not be run), total time,
+# time to its first cell, cells and error. Runs on a kernel from pool if given.
+def execute(path, kernel_name="python3", timeout=600, pool=None):
+    import nbformat
+    from nbclient import NotebookClient
+    from nbclient.exceptions import CellExecutionError, CellTimeoutError
+
+    path = Path(path)
+    notebook = nbformat.read(path, as_version=4)
+    cells = []
+    started = {}
+
+    def on_cell_execute(cell, cell_index):
+        started[cell_index] = time.perf_counter()
+
+    def on_cell_executed(cell, cell_index, execute_reply):
+        cells.append({"index": cell_index, "seconds": round(time.perf_counter() - started[cell_index], 4),
+                      "running_peak_mb": peak_memory(_kernel_pid(client.km)),
+                      "source": "".join(cell.source).strip().splitlines()[0][:80] if cell.source.strip() else ""})
+
+    start = time.perf_counter()
+    result = {"status": "passed", "error": None}
+    try:
+        with pool.kernel(cwd=path.parent) if pool else contextlib.nullcontext() as km:
+            client = NotebookClient(notebook, km=km, kernel_name=kernel_name, timeout=timeout, allow_errors=False,
+                                    resources={"metadata": {"path": str(path.parent)}},
+                                    on_cell_execute=on_cell_execute, on_cell_executed=on_cell_executed)
+            try:
+                client.execute()
+            finally:
+                # nbclient leaves its client connected to a kernel it was lent
+                if client.kc is not None:
+                    client.kc.stop_channels()
+    except CellTimeoutError as e:
+        result = {"status": "failed", "error": f"timeout: {str(e).splitlines()[0]}"}
+    except CellExecutionError as e:
+        result = {"status": "failed", "error": f"{e.ename}: {e.evalue}"}
+    except Exception as e:
+        # The kernel could not start or died: not the notebook's fault
+        result = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+    if result["error"] and started:
+        result["cell"] = max(started)
+    result.update(seconds=round(time.perf_counter() - start, 3), cells=cells)
+    if started:
+        result["first_cell_s"] = round(min(started.values()) - start, 3)
+    return result
+
+
+def _run(task):
+    path, kernel_name, timeout, pool = task
+    try:
+        return path, execute(path, kernel_name, timeout, pool)
+    except Exception as e:
+        return path, {"status": "error", "error": f"{type(e).__name__}: {e}", "seconds": 0, "cells": []}
+
+
+def report(results, slowest=10):
+    failed = {path: result for path, result in results.items() if result["status"] != "passed"}
+    print(f"\n{len(results)} notebooks, {len(results) - len(failed)} passed, {len(failed)} failed")
+    for path, result in failed.items():
+        cell = f" (cell {result['cell']})" if "cell" in result else ""
+        print(f"  ✗ {path}{cell}: {result['error']}" + (" (not run)" if result["status"] == "error" else ""))
+
+    first = [result["first_cell_s"] for result in results.values() if "first_cell_s" in result]
+    if first:
+        print(f"\nTime to first cell: median {statistics.median(first):.2f}s, max {max(first):.2f}s")
+
+    cells = [(cell["seconds"], path, cell) for path, result in results.items() for cell in result["cells"]]
+    if cells and slowest:
+        print("\nSlowest cells (time, kernel's running peak memory):")
+        for seconds, path, cell in sorted(cells, key=lambda c: c[0], reverse=True)[:slowest]:
+            peak = cell.get("running_peak_mb")
+            memory = f"{peak:7.0f} MB" if peak is not None else "        -"
+            print(f"  {seconds:7.2f}s {memory}  {path} [{cell['index']}] {cell['source']}")
+
+
+def run(notebooks, kernel_name="python3", jobs=None, timeout=600, force=False, slowest=10, warm=False):
+    start = time.perf_counter()
+    cache = read_cache()
+    environment = environment_hash(kernel_name)
+    results, todo = {}, []
+    for path in notebooks:
+        rel = notebook_name(path)
+        cached = cache.get(rel)
+        if not force and cached and cached.get("key") == notebook_key(path, environment):
+            results[rel] = cached
+        else:
+            todo.append(path)
+    print(f"{len(notebooks)} solution notebooks, {len(notebooks) - len(todo)} unchanged since their last run, "
+          f"executing {len(todo)}...")
+
+    with contextlib.ExitStack() as stack:
+        if warm and todo:
+            # Imported once here rather than by each thread, which could race importing it
+            import nbclient  # noqa: F401
+
+            # Threads sharing the pool's kernels (the kernels do the work)
+            pool = stack.enter_context(KernelPool(min(jobs or os.cpu_count(), len(todo)), kernel_name))
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=pool.size))
+        else:
+            pool = None
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+        for path, result in executor.map(_run, [(p, kernel_name, timeout, pool) for p in todo]):
+            rel = notebook_name(path)
+            results[rel] = result
+            # Errors of the harness or the kernel are not cached, the notebook is retried next time
+            if result["status"] != "error":
+                result["key"] = notebook_key(path, environment)
+                cache[rel] = result
+            print(f"  {'✓' if result['status'] == 'passed' else '✗'} {rel} ({result['seconds']:.1f}s)")
+            # Saved as it goes, so an interrupted run keeps what it did
+            write_cache(cache)
+
+    report(dict(sorted(results.items())), slowest)
+    print(f"\nDone in {time.perf_counter() - start:.1f}s")
+    return all(result["status"] == "passed" for result in results.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Execute the solution notebooks headless and report failures and "
+                                                 "the slowest cells, skipping the ones unchanged since their last run.")
+    parser.add_argument("paths", nargs="*", help="Notebooks to run (default: all the solution notebooks).")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of notebooks (kernels) run at once (default: one per CPU).")
+    parser.add_argument("-k", "--kernel", default="python3", help="Kernel to run them with (default: python3).")
+    parser.add_argument("--timeout", type=int, default=600, help="Time limit per cell in seconds (default: 600).")
+    parser.add_argument("--slowest", type=int, default=10, help="Number of slowest cells to report (default: 10).")
+    parser.add_argument("-f", "--force", action="store_true", help="Run every notebook, even unchanged ones.")
+    parser.add_argument("--warm", action="store_true",
+                        help="Run on a pool of kernels with the common imports preloaded (see kernel_pool.py).")
+    args = parser.parse_args()
+
+    notebooks = [Path(p) for p in args.paths] if args.paths else find_solutions()
+    if not run(notebooks, args.kernel, args.jobs, args.timeout, args.force, args.slowest, args.warm):
+        raise SystemExit(1)
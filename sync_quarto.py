@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from asset_store import AssetStore
+from notebook_to_qmd import notebook_to_qmd
+from notebook_transforms import read_notebook
+
+# Incremental version of copy_to_quarto.sh: copies the numbered folders into
+# quarto/ and converts the notebooks at the top of each folder to .qmd
+# (in-process, see notebook_to_qmd.py), with links to other notebooks
+# pointing to their .qmd, as copy_to_quarto_with_links.sh does.
+#
+# A manifest in quarto/ records the size, modification time and hash of every
+# source file and the output it produced. Files whose size and modification
+# time have not changed are not even read, files whose content has not
+# changed are not rewritten, and outputs whose source was deleted are removed.
+#
+# A .qmd is only overwritten if sync_quarto.py wrote it (the manifest records
+# the hash of the text it wrote; the {pyodide} chunks replace_python_with_pyodide.py
+# makes of its {python} chunks do not count as edits) or if it already has the
+# converted text. Pages edited by hand in quarto/ (front matter with resources,
+# figure captions, ...) are kept and reported instead; -f overwrites them.
+#
+# Copied files go through a content-addressed store in quarto/.assets (see
+# asset_store.py): each distinct content is stored once and the files in
+# quarto/ are reflinks or hard links to it when the filesystem allows, so files
+# with the same content (e.g. the same image in several folders) take space
+# once and a file already in the store is not copied again. The objects
+# themselves are reflinks of the sources on filesystems that support them
+# (Btrfs, XFS), where the mirror takes almost no extra space; elsewhere they
+# are copies, and the report says how much space they take besides the sources.
+ROOT = Path(__file__).resolve().parent
+DEST = ROOT / "quarto"
+MANIFEST_NAME = ".sync_manifest.json"
+STORE_NAME = ".assets"
+FOLDER = re.compile(r"\d+")
+VERSION = hashlib.sha256(b"".join(
+    (ROOT / name).read_bytes() for name in ("sync_quarto.py", "notebook_to_qmd.py"))).hexdigest()[:16]
+MB = 1024 * 1024
+# A {pyodide} chunk header with the caption replace_python_with_pyodide.py adds
+PYODIDE_CHUNK = re.compile(r'\{pyodide\}(\n#\| caption: "▶[^\n]*)?')
+
+
+class EditedOutput(Exception):
+    """A .qmd in quarto/ was changed since sync_quarto.py wrote it."""
+
+
+# Files of the numbered folders, without Jupyter's checkpoints (useless in the site)
+def source_files(root):
+    for folder in sorted(root.iterdir()):
+        if folder.is_dir() and FOLDER.fullmatch(folder.name):
+            yield from sorted(p for p in folder.rglob("*") if p.is_file() and ".ipynb_checkpoints" not in p.parts)
+
+
+# Notebooks directly inside a numbered folder become .qmd, everything else is copied
+def output_name(rel):
+    rel = Path(rel)
+    if rel.suffix == ".ipynb" and len(rel.parts) == 2:
+        return rel.with_suffix(".qmd").as_posix()
+    return rel.as_posix()
+
+
+def file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def read_manifest(dest):
+    try:
+        with open(dest / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(dest, manifest):
+    with open(dest / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Convert one notebook to .qmd, with links to notebooks pointing to their .qmd;
+# returns the hash of the text written (recorded as "written" in the manifest).
+# Raises EditedOutput instead of overwriting an output that is neither the
+# converted text nor the text last written (written_hash), unless force is set.
+def convert_notebook(source, output, written_hash=None, force=False):
+    text = notebook_to_qmd(read_notebook(source))
+    text = text.replace(".ipynb)", ".qmd)").replace(".ipynb#", ".qmd#")
+    if not force and output.exists():
+        existing = PYODIDE_CHUNK.sub("{python}", output.read_text(encoding="utf-8"))
+        if existing != text and text_hash(existing) != written_hash:
+            raise EditedOutput(f"{output} was edited since it was last synced")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(text, encoding="utf-8")
+    # Remove the notebook from the destination if an older sync copied it there
+    output.with_suffix(".ipynb").unlink(missing_ok=True)
+    return text_hash(text)
+
+
+# Copy a file, through the store if there is one; returns the method used and
+# how its content was added to the store (None if it was there already)
+def copy_file(source, output, digest, store=None):
+    if store is None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Never write through a hard link to a stored object
+        output.unlink(missing_ok=True)
+        shutil.copy2(source, output)
+        return "copy", None
+    stored = store.put(source, digest)
+    return store.materialize(digest, output), stored
+
+
+def _copy(task, store):
+    source, output, digest = task
+    try:
+        return source, *copy_file(source, output, digest, store), None
+    except Exception as e:
+        return source, None, None, f"{type(e).__name__}: {e}"
+
+
+def _convert(task):
+    source, output, written_hash, force = task
+    try:
+        return source, convert_notebook(source, output, written_hash, force), None
+    except EditedOutput as e:
+        return source, written_hash, e
+    except Exception as e:
+        return source, written_hash, f"{type(e).__name__}: {e}"
+
+
+# Work out what changed since the last sync: returns the new manifest, the
+# (source, output, hash of the text last written, force) to convert, the
+# (source, output, sha256) to copy and the stale outputs. Copied files are
+# recorded with the method used to materialize them, so switching the store on
+# or off redoes them, and, if they added their content to the store, with how
+# it was stored ("stored": reflink or copy of the source).
+def plan(root=ROOT, dest=DEST, force=False, use_store=True):
+    previous = read_manifest(dest)
+    manifest = {}
+    convert, copy = [], []
+
+    for path in source_files(root):
+        rel = path.relative_to(root).as_posix()
+        output = output_name(rel)
+        notebook = output != rel
+        stat = path.stat()
+        old = previous.get(rel, {})
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "output": output}
+        if notebook:
+            entry["version"] = VERSION
+
+        same_output = (old.get("output") == output and old.get("version") == entry.get("version")
+                       and (notebook or ("method" in old) == use_store) and (dest / output).exists())
+        if not force and same_output and old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns:
+            manifest[rel] = old
+            continue
+        entry["sha256"] = file_hash(path)
+        manifest[rel] = entry
+        if not force and same_output and old.get("sha256") == entry["sha256"]:
+            for key in ("method", "stored", "written"):
+                if key in old:
+                    entry[key] = old[key]
+            continue
+        if notebook:
+            convert.append((path, dest / output, old.get("written") if old.get("output") == output else None, force))
+        else:
+            copy.append((path, dest / output, entry["sha256"]))
+
+    outputs = {entry["output"] for entry in manifest.values()}
+    stale = sorted({dest / entry["output"] for rel, entry in previous.items()
+                    if rel not in manifest and entry["output"] not in outputs})
+    return manifest, convert, copy, stale
+
+
+# Space taken by the copied files: in the mirror, compared to a copy of each
+# file, and in the store, besides the sources (objects not known to be
+# reflinks of a source count as copies)
+def store_report(manifest, store):
+    linked, cloned = {}, set()
+    copied = total = 0
+    for entry in manifest.values():
+        method = entry.get("method")
+        if method is None:
+            continue
+        total += entry["size"]
+        if method == "copy":
+            copied += entry["size"]
+        else:
+            linked[entry["sha256"]] = entry["size"]
+        if entry.get("stored") == "reflink":
+            cloned.add(entry["sha256"])
+    objects = store.objects()
+    stored = sum(objects.values())
+    extra = sum(size for digest, size in objects.items() if digest not in cloned)
+    saved = total - copied - sum(linked.values())
+    print(f"Store: {total / MB:.1f} MB of copied files, {len(objects)} objects taking {stored / MB:.1f} MB, "
+          f"{saved / MB:.1f} MB less than a copy of each file"
+          + (f" ({copied / MB:.1f} MB could not be linked)" if copied else ""))
+    print(f"       {extra / MB:.1f} MB of objects are copies of the sources, "
+          f"{(stored - extra) / MB:.1f} MB share their blocks (reflinks)")
+
+
+def sync(root=ROOT, dest=DEST, jobs=None, force=False, dry_run=False, use_store=True):
+    start = time.perf_counter()
+    store = AssetStore(dest / STORE_NAME) if use_store else None
+    manifest, convert, copy, stale = plan(root, dest, force, use_store)
+    print(f"{len(manifest)} source files: converting {len(convert)} notebooks, copying {len(copy)} files, "
+          f"removing {len(stale)} stale outputs")
+    if dry_run:
+        for source, output, *_ in convert + copy:
+            print(f"  {source.relative_to(root)} → {output.relative_to(dest.parent)}")
+        for output in stale:
+            print(f"  remove {output.relative_to(dest.parent)}")
+        return True
+
+    failures = kept = 0
+    with ThreadPoolExecutor(max_workers=jobs) as threads:
+        copied = threads.map(lambda task: _copy(task, store), copy)
+        if len(convert) > 1 and jobs != 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                converted = list(pool.map(_convert, convert))
+        else:
+            converted = [_convert(task) for task in convert]
+        methods = {}
+        for source, method, stored, error in copied:
+            if error:
+                failures += 1
+                print(f"  ✗ Failed to copy {source.relative_to(root)}: {error}")
+                # Try again next time
+                del manifest[source.relative_to(root).as_posix()]
+                continue
+            if store is not None:
+                manifest[source.relative_to(root).as_posix()]["method"] = method
+                if stored:
+                    manifest[source.relative_to(root).as_posix()]["stored"] = stored
+            methods[method] = methods.get(method, 0) + 1
+            print(f"  ✓ Copied {source.relative_to(root)}" + (f" ({method})" if store is not None else ""))
+
+    for source, written, error in converted:
+        rel = source.relative_to(root).as_posix()
+        if isinstance(error, EditedOutput):
+            kept += 1
+            print(f"  ! Kept {manifest[rel]['output']}: edited in {dest.name}/, not overwritten (use -f to overwrite)")
+        elif error:
+            failures += 1
+            print(f"  ✗ Failed to convert {source.relative_to(root)}: {error}")
+        else:
+            manifest[rel]["written"] = written
+            print(f"  ✓ Converted {source.relative_to(root)}")
+        if error:
+            # Converted again next time, still knowing what was last written to the output
+            manifest[rel] = {"output": manifest[rel]["output"]} | ({"written": written} if written else {})
+
+    for output in stale:
+        output.unlink(missing_ok=True)
+        print(f"  ✓ Removed {output.relative_to(dest.parent)}")
+
+    write_manifest(dest, manifest)
+    if store is not None:
+        freed = store.prune({entry["sha256"] for entry in manifest.values() if "method" in entry})
+        if methods:
+            print("Materialized " + ", ".join(f"{n} as {method}" for method, n in sorted(methods.items())))
+        if freed:
+            print(f"Pruned {freed / MB:.1f} MB of unused objects from the store")
+        store_report(manifest, store)
+    print(f"Synced in {time.perf_counter() - start:.2f}s" + (f", {failures} files failed" if failures else "")
+          + (f", {kept} edited pages kept" if kept else ""))
+    return failures == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy the numbered folders into quarto/ and convert their notebooks "
+                                                 "to .qmd, only for files that changed since the last run.")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of parallel workers (default: one per CPU).")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="Copy and convert everything, overwriting pages edited in quarto/.")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Only show what would be done.")
+    parser.add_argument("--no-store", action="store_true",
+                        help=f"Make plain copies instead of linking files to the store in quarto/{STORE_NAME}.")
+    args = parser.parse_args()
+
+    DEST.mkdir(exist_ok=True)
+    if not sync(jobs=args.jobs, force=args.force, dry_run=args.dry_run, use_store=not args.no_store):
+        raise SystemExit(1)
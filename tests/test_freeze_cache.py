@@ -0,0 +1,53 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from freeze_cache import inspect_cache, prune_cache  # noqa: E402
+
+SCHEMA = """CREATE TABLE nbcache (pk INTEGER NOT NULL, hashkey VARCHAR(255) NOT NULL, uri VARCHAR(255) NOT NULL,
+    description VARCHAR(255) NOT NULL, data JSON, created DATETIME NOT NULL, accessed DATETIME NOT NULL,
+    PRIMARY KEY (pk), UNIQUE (hashkey))"""
+
+
+# A folder with a .jupyter_cache holding rows (hashkey, uri, created, accessed), each
+# with its executed/<hashkey>/base.ipynb, and the given source documents
+def make_cache(folder, rows, documents):
+    cache = folder / ".jupyter_cache"
+    cache.mkdir(parents=True)
+    with sqlite3.connect(cache / "global.db") as db:
+        db.execute(SCHEMA)
+        db.executemany("INSERT INTO nbcache (hashkey, uri, description, created, accessed) VALUES (?, ?, '', ?, ?)",
+                       rows)
+    db.close()
+    for hashkey, *_ in rows:
+        (cache / "executed" / hashkey).mkdir(parents=True)
+        (cache / "executed" / hashkey / "base.ipynb").write_text("{}")
+    for name in documents:
+        (folder / name).write_text("")
+    return cache
+
+
+def test_current_is_the_most_recently_accessed(tmp_path):
+    # The older execution is the one still in use (e.g. the document was reverted)
+    cache = make_cache(tmp_path, [
+        ("old", "lecture.quarto_ipynb", "2026-02-06 12:38:34", "2026-04-06 20:07:53"),
+        ("new", "lecture.quarto_ipynb", "2026-02-09 13:29:50", "2026-03-06 16:45:27"),
+        ("gone", "removed.quarto_ipynb", "2026-02-10 10:00:00", "2026-02-10 10:00:00"),
+    ], ["lecture.qmd"])
+    (cache / "executed" / "stray").mkdir()
+
+    status = {entry["hashkey"]: entry["status"] for entry in inspect_cache(cache)}
+    assert status == {"old": "current", "new": "stale", "gone": "orphaned", "stray": "stray"}
+
+
+def test_prune_keeps_the_current_entry(tmp_path):
+    cache = make_cache(tmp_path, [
+        ("a", "lecture.quarto_ipynb", "2026-02-06 12:00:00", "2026-02-06 12:00:00"),
+        ("b", "lecture.quarto_ipynb", "2026-02-07 12:00:00", "2026-02-08 12:00:00"),
+    ], ["lecture.qmd"])
+
+    prune_cache(cache, inspect_cache(cache))
+    assert [entry["hashkey"] for entry in inspect_cache(cache)] == ["b"]
+    assert sorted(p.name for p in (cache / "executed").iterdir()) == ["b"]
@@ -0,0 +1,55 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from make_masters import find_pairs, master_from_versions  # noqa: E402
+from make_variants import make_variants  # noqa: E402
+from notebook_transforms import dumps_notebook, read_notebook  # noqa: E402
+
+WEEKS = ["01", "02", "03", "04", "05"]
+
+
+# The week's master built from copies of its shipped solutions and demonstrator versions
+def build_master(week, folder):
+    for name in (f"week_{week}_solutions.ipynb", f"week_{week}_solutions_demonstrator_version.ipynb"):
+        shutil.copy(ROOT / week / name, folder / name)
+    [(solutions, demonstrator, master)] = find_pairs([folder])
+    notebook, _ = master_from_versions(read_notebook(solutions), read_notebook(demonstrator))
+    master.write_text(dumps_notebook(notebook), encoding="utf-8")
+    return master
+
+
+def lines(path):
+    return {line for cell in read_notebook(path)["cells"] for line in "".join(cell["source"]).splitlines()}
+
+
+@pytest.mark.parametrize("week", WEEKS)
+def test_variants_match_the_shipped_notebooks(week, tmp_path):
+    master = build_master(week, tmp_path)
+    results = dict((variant, written) for variant, _, written in
+                   make_variants(master, ["solutions", "demonstrator"]))
+
+    # The solutions version is the shipped file, byte for byte (it is not rewritten)
+    assert not results["solutions"]
+    assert (tmp_path / f"week_{week}_solutions.ipynb").read_bytes() == \
+        (ROOT / week / f"week_{week}_solutions.ipynb").read_bytes()
+
+    # The demonstrator version has every note of the shipped one; only titles and
+    # table of contents links take the solutions notebook's text
+    shipped = lines(ROOT / week / f"week_{week}_solutions_demonstrator_version.ipynb")
+    generated = lines(tmp_path / f"week_{week}_solutions_demonstrator_version.ipynb")
+    assert all(line.startswith(("#", " - ")) for line in shipped - generated)
+    assert all("tags" not in cell["metadata"] for cell in read_notebook(master.with_name(
+        f"week_{week}_solutions_demonstrator_version.ipynb"))["cells"])
+
+
+def test_student_version_needs_solution_tags(tmp_path):
+    master = build_master("01", tmp_path)
+    with pytest.raises(ValueError, match="no cells tagged 'sol'"):
+        make_variants(master, ["student"])
+    assert not (tmp_path / "week_01.ipynb").exists()
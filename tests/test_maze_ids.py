@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "05" / "src"))
+
+from maze_ids import generate_batch, generate_walls, parse_maze_id  # noqa: E402
+
+
+# Every maze of a batch must be rebuilt from its ID alone, also when p is not a whole percent
+@pytest.mark.parametrize("p", [0.2, 0.123, 0.255, 0.3])
+def test_batch_mazes_rebuild_from_their_ids(p):
+    maze_ids, walls = generate_batch(20, size=10, p=p, seed=12345)
+    assert walls.shape == (20, 10, 10)
+    for k, maze_id in enumerate(maze_ids):
+        np.testing.assert_array_equal(generate_walls(parse_maze_id(maze_id)), walls[k], err_msg=maze_id)
+
+
+def test_legacy_id_still_parses():
+    spec = parse_maze_id("10-30-12345")
+    assert (spec.version, spec.size, spec.wall_percent, spec.seed) == (1, 10, 30, 12345)
+    assert generate_walls(spec).shape == (10, 10)